@@ -0,0 +1,57 @@
+"""Compare JSON backends serializing recipe-like payloads into response bytes.
+
+Usage: python benchmarks/json_backends.py [--recipes N] [--number N]
+"""
+
+import argparse
+import timeit
+import uuid
+
+from toy.serializers import JSON_BACKENDS, JSONSerializer, get_json_backend
+
+
+def make_recipes(count):
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'name': f'Receita de pão de queijo #{i}',
+            'prep_time': 30 + i % 60,
+            'difficulty': i % 3 + 1,
+            'vegetarian': bool(i % 2),
+            'ratings': [{'id': str(uuid.uuid4()), 'value': v % 5 + 1} for v in range(i % 10)],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100)
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    payload = {'recipes': make_recipes(args.recipes)}
+    serializer = JSONSerializer()
+
+    for name, backend_class in JSON_BACKENDS.items():
+        if not backend_class.available():
+            print(f'{name:>8}: not installed')
+            continue
+
+        serializer.backend = get_json_backend(name)
+
+        # the previous code path: serialize to str and encode it again in Response
+        encode = timeit.timeit(lambda: serializer.dump(payload).encode('utf-8'), number=args.number)
+        dump_bytes = timeit.timeit(lambda: serializer.dump_bytes(payload, 'utf-8'), number=args.number)
+        content = serializer.dump_bytes(payload, 'utf-8')
+        load = timeit.timeit(lambda: serializer.load(content, 'utf-8'), number=args.number)
+
+        print(
+            f'{name:>8}: dump+encode {encode * 1000 / args.number:.3f}ms'
+            f'  dump_bytes {dump_bytes * 1000 / args.number:.3f}ms'
+            f'  load {load * 1000 / args.number:.3f}ms',
+        )
+
+
+if __name__ == '__main__':
+    main()
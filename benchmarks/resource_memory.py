@@ -0,0 +1,130 @@
+"""Measure the memory used by recipe resources with tracemalloc.
+
+The resources mirror the ones in examples/recipes, which need a database
+driver to be imported.
+
+Usage: python benchmarks/resource_memory.py [--recipes N] [--ratings N]
+"""
+
+import argparse
+import tracemalloc
+import uuid
+
+from toy import fields
+from toy.resources import Resource
+
+
+class RatingResource(Resource):
+    __slots__ = ()
+
+    fields = [
+        fields.UUIDField(name='id', required=True, lazy=True),
+        fields.IntegerField(name='value', min_value=1, max_value=5, required=True),
+    ]
+
+
+class RecipeResource(Resource):
+    __slots__ = ()
+
+    fields = [
+        fields.UUIDField(name='id', required=True, lazy=True),
+        fields.CharField(name='name', max_length=255, required=True),
+        fields.IntegerField(name='prep_time', min_value=0, required=True),
+        fields.IntegerField(name='difficulty', min_value=1, max_value=3, required=True),
+        fields.BooleanField(name='vegetarian', required=True),
+        fields.ResourceListField(name='ratings', resource_type=RatingResource),
+    ]
+
+
+class _DictField:
+    # the per-resource field copies of the previous layout: one object with a
+    # __dict__ for every field of every resource
+    def __init__(self, field):
+        self.name = field.name
+        self.lazy = field.lazy
+        self.required = field.required
+        self.validators = field.validators[:]
+        self._old_value = None
+        self._value = None
+        self.request = None
+        self.application_args = None
+        self._args = ()
+        self._kwargs = {}
+
+
+class DictResource:
+    """A resource stored like before schemas and slots: a __dict__ holding a
+    dict of field copies with their values."""
+
+    fields = []
+
+    def __init__(self, request=None, application_args=None, **data):
+        self.request = request
+        self.application_args = {} if application_args is None else application_args
+
+        self._fields = {}
+        for field in self.fields:
+            field_copy = _DictField(field)
+            field_copy.request = request
+            field_copy.application_args = self.application_args
+            self._fields[field.name] = field_copy
+
+        self._extra_data = {}
+        for key, value in data.items():
+            field_copy = self._fields[key]
+            field_copy._old_value, field_copy._value = field_copy._value, value
+
+    @classmethod
+    def get_schema(cls):
+        pass
+
+
+class DictRatingResource(DictResource):
+    fields = RatingResource.fields
+
+
+class DictRecipeResource(DictResource):
+    fields = RecipeResource.fields
+
+
+def build(resource_class, rating_class, recipes, ratings):
+    return [
+        resource_class(
+            id=uuid.UUID(int=i),
+            name=f'Recipe #{i}',
+            prep_time=30,
+            difficulty=2,
+            vegetarian=True,
+            ratings=[rating_class(id=uuid.UUID(int=j), value=j % 5 + 1) for j in range(ratings)],
+        )
+        for i in range(recipes)
+    ]
+
+
+def measure(resource_class, rating_class, recipes, ratings):
+    resource_class.get_schema()  # compiled once, not part of the per resource cost
+    rating_class.get_schema()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    resources = build(resource_class, rating_class, recipes, ratings)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del resources
+    return (after - before) / recipes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1000)
+    parser.add_argument('--ratings', type=int, default=0)
+    args = parser.parse_args()
+
+    for resource_class, rating_class in ((RecipeResource, RatingResource), (DictRecipeResource, DictRatingResource)):
+        per_recipe = measure(resource_class, rating_class, args.recipes, args.ratings)
+        print(f'{resource_class.__name__:>20}: {per_recipe:.0f} bytes per recipe ({args.ratings} ratings)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Compare payload size and throughput of the registered serializers on
+recipe-like payloads.
+
+Usage: python benchmarks/serializers.py [--recipes N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from json_backends import make_recipes
+
+from toy.serializers import CBORSerializer, JSONSerializer, MessagePackSerializer, serializers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100)
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    payload = {'recipes': make_recipes(args.recipes)}
+
+    for serializer_class in (JSONSerializer, MessagePackSerializer, CBORSerializer):
+        try:
+            serializer = serializers[serializer_class.content_type]
+        except KeyError:
+            print(f'{serializer_class.content_type:>20}: not installed')
+            continue
+
+        content = serializer.dump_bytes(payload, 'utf-8')
+        dump = timeit.timeit(lambda: serializer.dump_bytes(payload, 'utf-8'), number=args.number)
+        load = timeit.timeit(lambda: serializer.load(content, 'utf-8'), number=args.number)
+
+        print(
+            f'{serializer_class.content_type:>20}: {len(content)} bytes'
+            f'  dump {dump * 1000 / args.number:.3f}ms'
+            f'  load {load * 1000 / args.number:.3f}ms',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = '3b8d2c61a4e7'
+down_revision = 'f0e1624050ec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('recipes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('recipes', 'version')
@@ -1,4 +1,5 @@
 import argparse
+import os
 
 from prettyconf import config
 from sqlalchemy.exc import IntegrityError
@@ -6,7 +7,7 @@ from sqlalchemy_utils import create_database, database_exists, drop_database
 
 from recipes.database import get_db
 from recipes.models import User
-from toy.server import HTTPServer
+from toy.server import SERVER_MODES, HTTPServer
 
 from .application import RecipesApp, get_app
 
@@ -23,6 +24,9 @@ def main():
     runserver = subparsers.add_parser('runserver', help='start server')
     runserver.set_defaults(command='runserver')
     runserver.add_argument('--hostname', metavar='hostname[:port]')
+    runserver.add_argument('--mode', choices=SERVER_MODES, default=config('SERVER_MODE', default='simple'))
+    runserver.add_argument('--threads', type=int, default=config('SERVER_THREADS', default=8, cast=int))
+    runserver.add_argument('--workers', type=int, default=config('SERVER_WORKERS', default=os.cpu_count(), cast=int))
 
     initdb = subparsers.add_parser('initdb', help='create and initialize database')
     initdb.add_argument('--reset', action='store_true', help='will destroy your database and re-create it')
@@ -45,6 +49,10 @@ def main():
             application=applicaton,
             hostname=hostname,
             port=port,
+            mode=args.mode,
+            threads=args.threads,
+            workers=args.workers,
+            post_fork=applicaton.extensions['db'].reconnect,
         )
         server.run()
 
@@ -1,9 +1,17 @@
+import functools
+import secrets
+
 from prettyconf import config
 
 from toy.application import Application
+from toy.auth import CachedUserLoader, TokenBackend
+from toy.cache import MemoryCache
+from toy.serializers import JSONSerializer
 
 from . import handlers
+from .auth import REALM, PasswordBackend, load_user
 from .database import get_db
+from .passwords import CredentialCache, PasswordVerifier
 
 
 class RecipesApp(Application):
@@ -11,11 +19,38 @@ class RecipesApp(Application):
         self.config['debug'] = config('DEBUG', default=False, cast=config.boolean)
         self.config.setdefault('database_url', config('DATABASE_URL'))
 
+        JSONSerializer.use_backend(config('JSON_BACKEND', default='auto'))
+
+        credential_cache_ttl = config('CREDENTIAL_CACHE_TTL', default=300, cast=int)
+        passwords = PasswordVerifier(
+            workers=config('PASSWORD_HASH_WORKERS', default=2, cast=int),
+            cache=CredentialCache(ttl=credential_cache_ttl) if credential_cache_ttl else None,
+        )
+        self.add_extension('passwords', passwords)
+
+        # tokens signed with a random secret are only valid until the server restarts
+        self.token_backend = TokenBackend(
+            config('TOKEN_SECRET', default=secrets.token_hex(32)),
+            load_user=CachedUserLoader(functools.partial(load_user, self), ttl=60),
+            max_age=config('TOKEN_MAX_AGE', default=3600, cast=int),
+            realm=REALM,
+        )
+        self.password_backend = PasswordBackend(self)
+
         recipe_handler = handlers.Recipe(application=self)
+        rating_handler = handlers.Rating(application=self)
+
+        # ratings change the recipe representation, so both share the cache
+        cache_ttl = config('RESPONSE_CACHE_TTL', default=0, cast=int)
+        if cache_ttl:
+            recipe_handler.response_cache = rating_handler.response_cache = MemoryCache(ttl=cache_ttl)
+
+        self.add_route(r'^/tokens$', handlers.Tokens(application=self))
         self.add_route(r'^/recipes$', handlers.Recipes(application=self))  # GET only
+        self.add_route(r'^/recipes/export$', handlers.RecipesExport(application=self))
         self.add_route(r'^/recipes$', recipe_handler)  # POST only
         self.add_route(r'^/recipes/(?P<id>[0-9a-f-]+)$', recipe_handler)
-        self.add_route(r'^/recipes/(?P<id>[0-9a-f-]+)/rating$', handlers.Rating(application=self))
+        self.add_route(r'^/recipes/(?P<id>[0-9a-f-]+)/rating$', rating_handler)
 
 
 def get_app(**kwargs):
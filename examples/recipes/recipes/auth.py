@@ -0,0 +1,66 @@
+import binascii
+import uuid
+from base64 import b64decode
+
+from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
+
+from toy.auth import AuthenticationBackend
+
+from .models import User
+
+REALM = 'Recipes API'
+
+
+class PasswordBackend(AuthenticationBackend):
+    """Email and password of the custom ``helloworld`` scheme, checked with the
+    ``passwords`` extension of the application."""
+
+    scheme = 'helloworld'
+    realm = REALM
+
+    def __init__(self, application):
+        self.application = application
+
+    def _decode(self, credentials):
+        try:
+            decoded = b64decode(credentials.encode('ascii')).decode('ascii')
+        except (binascii.Error, UnicodeError):
+            return None, None
+
+        email, _, password = decoded.partition(':')
+        return email, password
+
+    def authenticate(self, request):
+        credentials = self.get_credentials(request)
+        if credentials is None:
+            return None
+
+        email, password = self._decode(credentials)
+        if not email or not password:
+            raise self.unauthorized()
+
+        db = self.application.extensions['db']
+        try:
+            user = db.session.query(User).filter(User.email == email).one()
+        except (NoResultFound, MultipleResultsFound):
+            db.session.rollback()
+            raise self.unauthorized()
+
+        if not self.application.extensions['passwords'].check(user, password):
+            db.session.rollback()
+            raise self.unauthorized()
+
+        return user
+
+
+def load_user(application, user_id):
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        return None
+
+    db = application.extensions['db']
+    user = db.session.query(User).get(user_id)
+    if user is not None:
+        db.session.expunge(user)  # cached users must not expire with the session
+    return user
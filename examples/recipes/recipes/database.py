@@ -1,6 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import configure_mappers, sessionmaker
+from sqlalchemy.orm import configure_mappers, scoped_session, sessionmaker
 from sqlalchemy_searchable import make_searchable
 
 
@@ -11,10 +11,9 @@ class Database:
         self.database_url = None
         self.engine = None
         self.connection = None
-        self.session = None
 
         self.Model = declarative_base()
-        self.Session = sessionmaker()
+        self.Session = scoped_session(sessionmaker())  # one session per thread
 
         make_searchable(self.Model.metadata)
 
@@ -23,11 +22,27 @@ class Database:
         self.connect(self.database_url, application.debug)
         application.extensions['db'] = self
 
+    @property
+    def session(self):
+        if self.engine is None:
+            return None
+        return self.Session()
+
     def connect(self, database_url, debug=False):
         self.engine = create_engine(database_url, echo=debug)
         self.Session.configure(bind=self.engine)
         self.connection = self.engine.connect()
-        self.session = self.Session()
+
+    def reconnect(self):
+        """Replace the connections inherited from the parent process, which
+        still uses them, with new ones. Called in every worker of the prefork
+        server."""
+        self.Session.registry.clear()
+        try:
+            self.engine.dispose(close=False)
+        except TypeError:  # SQLAlchemy < 1.4.33, where dispose() always closes the connections
+            self.engine.pool = self.engine.pool.recreate()
+        self.connection = self.engine.connect()
 
     def create_tables(self):
         configure_mappers()
@@ -1,79 +1,83 @@
-import binascii
-from base64 import b64decode
+from staty import codes as status
 
-from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
-
-from recipes.models import User
+from toy.concurrency import SingleFlight
 from toy.exceptions import UnauthorizedException
-from toy.handlers import ResourceHandler
+from toy.handlers import Handler, ResourceHandler
+from toy.http import Response, StreamingResponse
+from toy.serializers import JSONSerializer, NDJSONSerializer, serializers
 
+from .auth import REALM
 from .resources import RatingResource, RecipeResource, RecipesResource
 
 MAX_PAGE_SIZE = 50
 
 
 class AuthorizationResourceHandler(ResourceHandler):
-    authorization_required = []
-
-    def _get_db(self):
+    @property
+    def authentication_backends(self):
         app = self.application_args['application']
-        return app.extensions['db']
-
-    def _get_credentials(self, request) -> dict:
-        auth = request.headers.get('Authorization')
-        if auth is None:
-            return {}
-
-        auth_type, encoded = auth.split(' ', 1)
-        if auth_type.lower() != 'helloworld':
-            return {}
-
-        try:
-            decoded = b64decode(encoded.encode('ascii')).decode('ascii')
-        except binascii.Error:
-            return {}
-
-        email, password = decoded.split(':', 1)
-        if not email or not password:
-            return {}
-
-        return {'email': email, 'password': password}
-
-    def authorize(self, request):
-        method = request.method.lower()
-        if method not in [m.lower() for m in self.authorization_required]:
-            return
+        return [app.token_backend, app.password_backend]
 
-        credentials = self._get_credentials(request)
-        if not credentials:
-            raise UnauthorizedException('Basic', 'Recipes API')
+    def unauthorized(self):
+        return UnauthorizedException('Basic', REALM)
 
-        db = self._get_db()
 
-        try:
-            user = db.session.query(User).filter(User.email == credentials['email']).one()
-        except (NoResultFound, MultipleResultsFound):
-            db.session.rollback()
-            raise UnauthorizedException('Basic', 'Recipes API')
+class Tokens(Handler):
+    """Exchange the email and password of a user for a bearer token."""
 
-        if not user.check_password(credentials['password']):
-            db.session.rollback()
-            raise UnauthorizedException('Basic', 'Recipes API')
-
-        request.user = user
+    allowed_methods = ['post']
+    authentication_required = ['post']
+
+    @property
+    def authentication_backends(self):
+        return [self.application_args['application'].password_backend]
+
+    def post(self, request):
+        tokens = self.application_args['application'].token_backend
+        data = {
+            'token': tokens.issue(request.user.id),
+            'token_type': tokens.scheme,
+            'expires_in': tokens.max_age,
+        }
+        # always JSON: clients without an Accept header would negotiate application/octet-stream
+        serializer = serializers[JSONSerializer.content_type]
+        return Response(
+            serializer.dump_bytes(data, 'utf-8'),
+            status=status.Ok(),
+            content_type=f'{JSONSerializer.content_type}; charset=utf-8',
+        )
 
 
 class Recipes(AuthorizationResourceHandler):
     allowed_methods = ['get']
     route_template = '/recipes'
     resource_type = RecipesResource
+    streaming = True
+
+
+class RecipesExport(AuthorizationResourceHandler):
+    """All recipes as NDJSON. Import them again with a bulk POST to /recipes."""
+
+    allowed_methods = ['get']
+    route_template = '/recipes/export'
+    resource_type = RecipeResource
+
+    def get(self, request):
+        serializer = serializers[NDJSONSerializer.content_type]
+        recipes = self.resource_type.iter_all(request=request, application_args=self.application_args)
+        return StreamingResponse(
+            serializer.iter_dump(recipes),
+            content_type=f'{NDJSONSerializer.content_type}; charset=utf-8',
+        )
 
 
 class Recipe(AuthorizationResourceHandler):
     allowed_methods = ['get', 'post', 'delete', 'patch', 'put']
     route_template = '/recipes/<id>'
     resource_type = RecipeResource
-    authorization_required = ['post', 'put', 'patch', 'delete']
+    authentication_required = ['post', 'put', 'patch', 'delete']
+    bulk = True
+    single_flight = SingleFlight()
 
 
 class Rating(AuthorizationResourceHandler):
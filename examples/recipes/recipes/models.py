@@ -1,10 +1,11 @@
 import base64
 import hashlib
+import hmac
 import random
 from datetime import timedelta
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, ForeignKey, Interval, SmallInteger, String
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, Interval, SmallInteger, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy_utils import TSVectorType
@@ -36,6 +37,15 @@ def hash_password(password, salt=None, iterations=180000, alg='pbkdf2_sha256'):
     return f'{alg}${iterations}${salt}${passwd_hash}'
 
 
+def check_password_hash(encoded, raw_password):
+    if encoded is None or encoded.count('$') < 3:
+        return False
+
+    alg, iterations, salt, _ = encoded.split('$', 3)
+    result = hash_password(raw_password, salt, int(iterations), alg)
+    return hmac.compare_digest(encoded, result)
+
+
 class User(db.Model):
     __tablename__ = 'users'
 
@@ -43,16 +53,13 @@ class User(db.Model):
     email = Column(String(length=255), unique=True)
     password = Column(String(length=255), nullable=True)
 
+    authenticated = True  # see toy.http.Request.authenticated
+
     def set_password(self, raw_password):
         self.password = hash_password(raw_password)
 
     def check_password(self, raw_password):
-        if self.password.count('$') < 3:
-            return False
-
-        alg, iterations, salt, _ = self.password.split('$', 3)
-        result = hash_password(raw_password, salt, int(iterations), alg)
-        return self.password == result
+        return check_password_hash(self.password, raw_password)
 
 
 class Recipe(db.Model):
@@ -63,11 +70,15 @@ class Recipe(db.Model):
     prep_time = Column(Interval, nullable=False)
     difficulty = Column(SmallInteger, nullable=False)
     vegetarian = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, default=1, server_default='1')  # bumped on every change
 
     ratings = relationship('Rating', back_populates='recipe', cascade='all, delete-orphan')
 
     search = Column(TSVectorType('name'))
 
+    def bump_version(self):
+        self.version = Recipe.version + 1  # evaluated by the database
+
     @validates('prep_time')
     def validate_preptime(self, _, value):
         if value < timedelta(0):
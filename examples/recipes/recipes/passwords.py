@@ -0,0 +1,88 @@
+"""Password verification for authenticated requests.
+
+PBKDF2 is slow on purpose, so the hashes are computed in a process pool,
+off the request threads, and credentials that were verified once are kept
+in a :class:`CredentialCache` for a while.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from toy.cache import MemoryCache
+
+from .models import check_password_hash
+
+
+class CredentialCache:
+    """Bounded cache of verified credentials.
+
+    Entries are keyed by an HMAC of the credentials with a secret of the
+    process, so passwords are never kept in memory, and hold the password
+    hash of the user when they were verified: a password change makes them
+    stale in every worker.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300, secret=None):
+        self._secret = secret or secrets.token_bytes(32)
+        self._entries = MemoryCache(max_entries=max_entries, ttl=ttl)
+
+    def _key(self, email, password):
+        digest = hmac.new(self._secret, f'{email}\0{password}'.encode('utf-8'), hashlib.sha256).digest()
+        return email, digest
+
+    def is_verified(self, email, password, password_hash) -> bool:
+        verified_hash = self._entries.get(self._key(email, password))
+        return verified_hash is not None and hmac.compare_digest(verified_hash, password_hash)
+
+    def add(self, email, password, password_hash):
+        self._entries.set(self._key(email, password), password_hash)
+
+    def invalidate(self, email):
+        self._entries.invalidate(email)
+
+
+class PasswordVerifier:
+    """Check user passwords in a pool of ``workers`` processes (``0`` checks
+    them in the calling thread), consulting ``cache`` first."""
+
+    def __init__(self, workers=2, cache=None):
+        self.workers = workers
+        self.cache = cache
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            # pools can't be used from forked server workers
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _check_password_hash(self, password_hash, password):
+        if not self.workers:
+            return check_password_hash(password_hash, password)
+        return self._get_pool().submit(check_password_hash, password_hash, password).result()
+
+    def check(self, user, password) -> bool:
+        if user.password is None:
+            return False
+
+        if self.cache is not None and self.cache.is_verified(user.email, password, user.password):
+            return True
+
+        verified = self._check_password_hash(user.password, password)
+        if verified and self.cache is not None:
+            self.cache.add(user.email, password, user.password)
+        return verified
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown()
+            self._pool = None
@@ -1,5 +1,5 @@
 from datetime import timedelta
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import func
 from sqlalchemy_searchable import search
@@ -11,6 +11,8 @@ from toy.resources import Resource
 
 
 class BaseResource(Resource):
+    __slots__ = ()
+
     @staticmethod
     def _get_db(application_args):
         app = application_args['application']
@@ -18,6 +20,8 @@ class BaseResource(Resource):
 
 
 class RatingResource(BaseResource):
+    __slots__ = ()
+
     fields = [
         fields.UUIDField(name='id', required=True, lazy=True),
         fields.IntegerField(name='value', min_value=1, max_value=5, required=True),
@@ -41,6 +45,7 @@ class RatingResource(BaseResource):
 
         rating = Rating(value=self['value'])
         recipe.ratings.append(rating)
+        recipe.bump_version()
         db.session.commit()
 
         self['id'] = rating.id
@@ -64,6 +69,8 @@ class RatingResource(BaseResource):
 
 
 class RecipeResource(BaseResource):
+    __slots__ = ()
+
     fields = [
         fields.UUIDField(name='id', required=True, lazy=True),
         fields.CharField(name='name', max_length=255, required=True),
@@ -108,6 +115,7 @@ class RecipeResource(BaseResource):
             )
 
     def save_to_model(self, recipe, db=None):
+        recipe.bump_version()
         recipe.name = self['name']
         recipe.prep_time = timedelta(minutes=self['prep_time'])
         recipe.difficulty = self['difficulty']
@@ -120,6 +128,21 @@ class RecipeResource(BaseResource):
         for rating in self['ratings']:
             rating.create(parent_resource=self)
 
+    @classmethod
+    def do_get_version(cls, request=None, application_args=None):
+        db = cls._get_db(application_args)
+
+        try:
+            recipe_id = UUID(request.path_arguments['id'])
+        except (KeyError, ValueError):
+            return None
+
+        version = db.session.query(Recipe.version).filter(Recipe.id == recipe_id).scalar()
+        db.session.rollback()
+        if version is None:
+            return None  # do_get reports the missing recipe
+        return f'{recipe_id}-{version}'
+
     @classmethod
     def do_get(cls, request=None, application_args=None):
         db = cls._get_db(application_args)
@@ -152,6 +175,65 @@ class RecipeResource(BaseResource):
 
         db.session.commit()
 
+    @classmethod
+    def iter_all(cls, request=None, application_args=None, batch_size=100):
+        """Yield every recipe, fetching ``batch_size`` rows at a time."""
+        db = cls._get_db(application_args)
+
+        for recipe in db.session.query(Recipe).order_by(Recipe.name).yield_per(batch_size):
+            resource = cls(request=request, application_args=application_args)
+            resource.load_from_model(recipe)
+            yield resource
+
+    @classmethod
+    def do_bulk_create(cls, resources, request=None, application_args=None):
+        if not resources:
+            return
+
+        # the rows skip rating.create() and the model @validates hooks, so
+        # every recipe and nested rating is validated before building them
+        errors = {}
+        for index, resource in enumerate(resources):
+            for name, field_errors in resource.validate(include_lazy=False).items():
+                errors[f'{index}.{name}'] = field_errors
+            for position, rating in enumerate(resource['ratings']):
+                for name, field_errors in rating.validate(include_lazy=False).items():
+                    errors[f'{index}.ratings.{position}.{name}'] = field_errors
+
+        if errors:
+            raise ValidationException('Validation Error', errors=errors)
+
+        db = cls._get_db(application_args)
+
+        recipe_rows = []
+        rating_rows = []
+        for resource in resources:
+            resource['id'] = uuid4()
+            recipe_rows.append(
+                {
+                    'id': resource['id'],
+                    'name': resource['name'],
+                    'prep_time': timedelta(minutes=resource['prep_time']),
+                    'difficulty': resource['difficulty'],
+                    'vegetarian': resource['vegetarian'],
+                    'version': 1,
+                },
+            )
+
+            for rating in resource['ratings']:
+                rating['id'] = uuid4()
+                rating_rows.append({'id': rating['id'], 'recipe_id': resource['id'], 'value': rating['value']})
+
+        # one multi-row INSERT per table in a single transaction
+        try:
+            db.session.execute(Recipe.__table__.insert().values(recipe_rows))
+            if rating_rows:
+                db.session.execute(Rating.__table__.insert().values(rating_rows))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
     def do_remove(self):
         db = self._get_db(self.application_args)
         recipe = self._load_object_or_not_found(db)
@@ -179,6 +261,8 @@ class RecipeResource(BaseResource):
 
 
 class RecipesResource(BaseResource):
+    __slots__ = ()
+
     fields = [
         fields.IntegerField(name='offset'),
         fields.IntegerField(name='limit'),
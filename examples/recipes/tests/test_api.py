@@ -1,3 +1,5 @@
+import json
+from base64 import b64encode
 from datetime import timedelta
 from uuid import UUID
 
@@ -58,6 +60,47 @@ def test_fail_create_recipe_missing_required_field(client, database, user_creden
     assert errors[0]['message'] == 'Required field'
 
 
+def test_bulk_create_recipes(client, recipe_data, database, user_credentials):
+    response = client.post_json('/recipes', [recipe_data] * 3, headers=user_credentials)
+    assert response.status == '201 Created'
+
+    json = response.json
+    assert len(json) == 3
+    assert all(UUID(item['id']) for item in json)
+    assert all(item['ratings'][0]['id'] is not None for item in json)
+
+    recipes = database.session.query(Recipe).all()
+    assert len(recipes) == 3
+    assert all(len(recipe.ratings) == 1 for recipe in recipes)
+
+
+def test_fail_bulk_create_recipes_invalid_rating(client, recipe_data, database, user_credentials):
+    invalid = [{**recipe_data, 'ratings': [{'value': 9}]}, {**recipe_data, 'ratings': [{}]}]
+    response = client.post_json('/recipes', [recipe_data, *invalid], headers=user_credentials, status=400)
+    assert response.status == '400 Bad Request'
+
+    errors = {error['field'] for error in response.json['errors']}
+    assert errors == {'1.ratings.0.value', '2.ratings.0.value'}
+    assert database.session.query(Recipe).count() == 0
+
+
+def test_export_and_import_recipes(client, recipes, database, user_credentials):
+    response = client.get('/recipes/export')
+    assert response.status == '200 OK'
+    assert response.content_type == 'application/x-ndjson'
+
+    lines = response.body.splitlines()
+    assert len(lines) == len(recipes)
+
+    response = client.post(
+        '/recipes',
+        response.body,
+        headers={**user_credentials, 'Content-Type': 'application/x-ndjson; charset=utf-8'},
+    )
+    assert response.status == '201 Created'
+    assert database.session.query(Recipe).count() == 2 * len(recipes)
+
+
 def test_fail_create_recipe_wrong_credentials(client, recipe_data, database, unknown_user):
     response = client.post_json('/recipes', recipe_data, headers=unknown_user, status=401)
     assert response.status == '401 Unauthorized'
@@ -66,6 +109,64 @@ def test_fail_create_recipe_wrong_credentials(client, recipe_data, database, unk
     assert len(recipes) == 0
 
 
+def test_fail_create_recipe_without_credentials(client, recipe_data, database):
+    response = client.post_json('/recipes', recipe_data, status=401)
+    assert response.headers['WWW-Authenticate'] == 'Basic realm="Recipes API"'
+
+
+def test_get_recipe_ignores_credentials(client, saved_recipe):
+    headers = {'Authorization': 'Bearer invalid', 'Accept': 'application/json'}
+    response = client.get(f'/recipes/{saved_recipe.id}', headers=headers)
+    assert response.status == '200 OK'
+
+
+def test_create_recipe_with_token(client, recipe_data, database, user):
+    credentials = b64encode(f'{user.email}:sekret'.encode('ascii')).decode('ascii')
+    response = client.post(
+        '/tokens',
+        headers={'Authorization': f'helloworld {credentials}', 'Accept': 'application/json'},
+    )
+    assert response.content_type == 'application/json'
+    token = json.loads(response.body)
+    assert token['token_type'] == 'Bearer'
+
+    headers = {'Authorization': f'Bearer {token["token"]}'}
+    response = client.post_json('/recipes', recipe_data, headers=headers)
+    assert response.status == '201 Created'
+
+    client.post_json('/recipes', recipe_data, headers={'Authorization': 'Bearer invalid'}, status=401)
+
+
+def test_create_token_without_accept_header(client, database, user):
+    credentials = b64encode(f'{user.email}:sekret'.encode('ascii')).decode('ascii')
+    response = client.post('/tokens', headers={'Authorization': f'helloworld {credentials}'})
+
+    assert response.status == '200 OK'
+    assert response.headers['Content-Type'] == 'application/json; charset=utf-8'
+    token = json.loads(response.body)
+    assert token['token_type'] == 'Bearer'
+    assert token['token']
+
+
+def test_get_recipe_not_modified(client, saved_recipe, database):
+    response = client.get(f'/recipes/{saved_recipe.id}', headers={'Accept': 'application/json'})
+    etag = response.headers['ETag']
+
+    response = client.get(
+        f'/recipes/{saved_recipe.id}',
+        headers={'Accept': 'application/json', 'If-None-Match': etag},
+        status=304,
+    )
+    assert response.body == b''
+
+    saved_recipe.bump_version()
+    database.session.commit()
+
+    response = client.get(f'/recipes/{saved_recipe.id}', headers={'Accept': 'application/json', 'If-None-Match': etag})
+    assert response.status == '200 OK'
+    assert response.headers['ETag'] != etag
+
+
 def test_get_recipe(client, saved_recipe, database):
     response = client.get(
         f'/recipes/{saved_recipe.id}',
@@ -20,6 +20,20 @@ def test_database_init_db(create_test_db, database_url):
     assert app.extensions['db'] == db
 
 
+def test_database_reconnect(create_test_db, database_url):
+    app = RecipesApp(database_url=database_url)
+    db = Database()
+    db.init_app(app)
+    inherited = db.connection
+
+    db.reconnect()
+
+    assert not inherited.closed  # still used by the parent process
+    assert db.connection is not inherited
+    assert not db.connection.closed
+    assert db.session.bind is db.engine
+
+
 def test_database_get_db():
     application = RecipesApp()
     db = get_db()
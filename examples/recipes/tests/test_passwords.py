@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from recipes.models import hash_password
+from recipes.passwords import CredentialCache, PasswordVerifier
+
+
+def make_user(password):
+    return SimpleNamespace(email='foo@example.com', password=hash_password(password, iterations=1000))
+
+
+def test_credential_cache():
+    cache = CredentialCache()
+    cache.add('foo@example.com', 'sekret', 'hash')
+
+    assert cache.is_verified('foo@example.com', 'sekret', 'hash')
+    assert not cache.is_verified('foo@example.com', 'sekret', 'new-hash')
+    assert not cache.is_verified('foo@example.com', 'other', 'hash')
+
+    cache.invalidate('foo@example.com')
+    assert not cache.is_verified('foo@example.com', 'sekret', 'hash')
+
+
+def test_password_verifier_caches_verified_passwords():
+    user = make_user('sekret')
+    verifier = PasswordVerifier(workers=0, cache=CredentialCache())
+
+    assert not verifier.check(user, 'wrong')
+    assert verifier.check(user, 'sekret')
+
+    with patch('recipes.passwords.check_password_hash') as check_password_hash:
+        assert verifier.check(user, 'sekret')
+    check_password_hash.assert_not_called()
+
+    # a password change makes the cached credentials stale
+    user.password = hash_password('changed', iterations=1000)
+    assert not verifier.check(user, 'sekret')
+    assert verifier.check(user, 'changed')
+
+
+def test_password_verifier_process_pool():
+    verifier = PasswordVerifier(workers=1)
+    try:
+        assert verifier.check(make_user('sekret'), 'sekret')
+        assert not verifier.check(make_user('sekret'), 'wrong')
+    finally:
+        verifier.shutdown()
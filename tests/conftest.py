@@ -1,3 +1,4 @@
+import asyncio
 import json
 from io import BytesIO
 
@@ -207,3 +208,35 @@ def compound_resource(composite_resource_class):
     resource = composite_resource_class()
     resource.update(data)
     return resource
+
+
+def _asgi_call(app, method, path, body=b'', headers=None, query_string=b''):
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'query_string': query_string,
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in (headers or {}).items()],
+        'server': ('testserver', 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    start, *body_messages = sent
+    headers = {k.decode('latin-1'): v.decode('latin-1') for k, v in start['headers']}
+    return start['status'], headers, b''.join(m['body'] for m in body_messages)
+
+
+@pytest.fixture()
+def asgi_call():
+    return _asgi_call
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import Mock
 
 import pytest
@@ -6,7 +7,7 @@ from webtest import TestApp
 
 from toy.application import Application
 from toy.exceptions import UnauthorizedException
-from toy.http import Request
+from toy.http import Request, Response, StreamingResponse, asgi_to_environ
 
 
 def test_basic_application():
@@ -139,3 +140,119 @@ def test_application_call_handler(application, envbuilder):
 
     handler.assert_called_once_with(request)
     assert request.path_arguments == {'arg': 'test-argument'}
+
+
+def test_application_call_handler_does_not_leak_path_arguments(application, envbuilder):
+    handler = Mock()
+    application.add_route(r'^/items(/(?P<arg>.+))?$', handler)
+
+    first = Request(envbuilder('GET', '/items/first'))
+    application.call_handler(first)
+
+    second = Request(envbuilder('GET', '/items'))
+    application.call_handler(second)
+
+    assert first.path_arguments == {'arg': 'first'}
+    assert second.path_arguments == {'arg': None}
+    assert application.routes[1].__dict__.get('path_arguments') is None
+
+
+def test_asgi_request_to_app(application, handler, asgi_call):
+    application.add_route(r'^/test', handler)
+
+    status, headers, body = asgi_call(application.asgi, 'GET', '/test')
+
+    assert status == 200
+    assert headers['content-type'] == 'text/plain; charset=utf-8'
+    assert body == b'Hello!'
+
+
+def test_asgi_request_with_body_and_arguments(application, asgi_call):
+    def echo(request):
+        content = f'{request.method} {request.path_arguments["arg"]} {request.query_string} {request.data}'
+        return Response(content, content_type='text/plain; charset=utf-8')
+
+    application.add_route(r'^/echo/(?P<arg>.+)$', echo)
+
+    status, _, body = asgi_call(
+        application.asgi,
+        'POST',
+        '/echo/value',
+        body=b'payload',
+        headers={'Content-Type': 'text/plain; charset=utf-8', 'Content-Length': '7'},
+        query_string=b'spam=1',
+    )
+
+    assert status == 200
+    assert body == b"POST value {'spam': ['1']} payload"
+
+
+def test_asgi_request_with_repeated_headers():
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'headers': [(b'cookie', b'a=1'), (b'cookie', b'b=2'), (b'accept', b'text/html'), (b'accept', b'*/*')],
+    }
+
+    environ = asgi_to_environ(scope, b'')
+
+    assert environ['HTTP_COOKIE'] == 'a=1; b=2'
+    assert environ['HTTP_ACCEPT'] == 'text/html,*/*'
+
+
+def test_asgi_request_to_not_found_route(application, asgi_call):
+    status, _, body = asgi_call(application.asgi, 'GET', '/not-found', headers={'Accept': 'application/json'})
+
+    assert status == 404
+    assert body == b'{"errors": ["Not Found"]}'
+
+
+def test_asgi_lifespan(application):
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application.asgi({'type': 'lifespan'}, receive, send))
+
+    assert sent == [{'type': 'lifespan.startup.complete'}, {'type': 'lifespan.shutdown.complete'}]
+
+
+def test_request_body_too_large(application):
+    application.config['max_body_size'] = 4
+    application.add_route(r'^/upload$', lambda request: Response(request.data))
+
+    app = TestApp(application)
+
+    response = app.post('/upload', params=b'0123456789', status=413)
+    assert response.status == '413 Payload Too Large'
+
+    response = app.post('/upload', params=b'0123', status=200)
+    assert response.body == b'0123'
+
+
+def test_asgi_request_body_too_large(application, asgi_call):
+    application.config['max_body_size'] = 4
+    application.add_route(r'^/upload$', lambda request: Response(request.data))
+
+    status, _, _ = asgi_call(application.asgi, 'POST', '/upload', body=b'0123456789')
+    assert status == 413
+
+
+def test_streaming_response(application, asgi_call):
+    def export(request):
+        return StreamingResponse((f'line {i}\n' for i in range(3)), content_type='text/plain; charset=utf-8')
+
+    application.add_route(r'^/export$', export)
+
+    response = TestApp(application).get('/export')
+    assert response.body == b'line 0\nline 1\nline 2\n'
+
+    status, _, body = asgi_call(application.asgi, 'GET', '/export')
+    assert status == 200
+    assert body == b'line 0\nline 1\nline 2\n'
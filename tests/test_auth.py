@@ -0,0 +1,113 @@
+import pytest
+from webtest import TestApp
+
+from toy.application import Application
+from toy.auth import AuthenticationBackend, CachedUserLoader, TokenBackend
+from toy.exceptions import UnauthorizedException
+from toy.handlers import Handler
+from toy.http import Request, Response
+
+
+class User:
+    authenticated = True
+
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+USERS = {'1': User('1')}
+
+
+@pytest.fixture()
+def tokens():
+    return TokenBackend('secret', load_user=USERS.get, max_age=60, realm='Test API')
+
+
+def _request(envbuilder, method='GET', authorization=None):
+    kwargs = {} if authorization is None else {'authorization': authorization}
+    return Request(envbuilder(method, '/', **kwargs))
+
+
+def test_token_backend_issue_and_verify(tokens):
+    token = tokens.issue('1', now=1000)
+
+    assert tokens.verify(token, now=1060) == '1'
+    assert tokens.verify(token, now=1061) is None
+    assert tokens.verify(token + 'x', now=1000) is None
+    assert tokens.verify(token.replace(token[0], 'X', 1), now=1000) is None
+    assert TokenBackend('other', load_user=USERS.get).verify(token, now=1000) is None
+    assert tokens.verify('não.é.token', now=1000) is None
+
+
+def test_token_backend_authenticate(envbuilder, tokens):
+    user = tokens.authenticate(_request(envbuilder, authorization=f'Bearer {tokens.issue("1")}'))
+    assert user is USERS['1']
+
+    assert tokens.authenticate(_request(envbuilder)) is None
+    assert tokens.authenticate(_request(envbuilder, authorization='Basic Zm9vOmJhcg==')) is None
+
+    with pytest.raises(UnauthorizedException):
+        tokens.authenticate(_request(envbuilder, authorization='Bearer invalid'))
+
+    with pytest.raises(UnauthorizedException):
+        tokens.authenticate(_request(envbuilder, authorization=f'Bearer {tokens.issue("2")}'))
+
+
+def test_fail_token_backend_without_secret():
+    with pytest.raises(ValueError):
+        TokenBackend('', load_user=USERS.get)
+
+
+def test_cached_user_loader():
+    loaded = []
+
+    def load(user_id):
+        loaded.append(user_id)
+        return USERS.get(user_id)
+
+    load_user = CachedUserLoader(load, ttl=60)
+
+    assert load_user('1') is load_user('1') is USERS['1']
+    assert load_user('2') is None
+    assert load_user('2') is None
+    assert loaded == ['1', '2', '2']
+
+    load_user.invalidate('1')
+    load_user('1')
+    assert loaded == ['1', '2', '2', '1']
+
+
+def test_handler_authentication_backends(envbuilder, tokens, asgi_call):
+    class AnonymousBackend(AuthenticationBackend):
+        def authenticate(self, request):
+            return None
+
+    class MyHandler(Handler):
+        allowed_methods = ['get', 'post']
+        authentication_backends = [tokens, AnonymousBackend()]
+        authentication_required = ['post']
+
+        def get(self, request):
+            return Response(f'{request.authenticated}')
+
+        def post(self, request):
+            return Response(request.user.id)
+
+    app = Application()
+    app.add_route(r'^/$', MyHandler())
+    client = TestApp(app)
+
+    assert client.get('/').text == 'False'
+    assert client.get('/', headers={'Authorization': 'Bearer invalid'}).text == 'False'
+
+    response = client.post('/', status=401)
+    assert response.headers['WWW-Authenticate'] == 'Bearer realm="Test API"'
+
+    response = client.post('/', headers={'Authorization': f'Bearer {tokens.issue("1")}'})
+    assert response.text == '1'
+
+    status, _, _ = asgi_call(app.asgi, 'POST', '/')
+    assert status == 401
+
+    status, _, body = asgi_call(app.asgi, 'POST', '/', headers={'Authorization': f'Bearer {tokens.issue("1")}'})
+    assert (status, body) == (200, b'1')
@@ -0,0 +1,197 @@
+import json
+import time
+from multiprocessing.managers import RemoteError
+
+import pytest
+
+from toy.cache import MemoryCache, SocketCache, start_cache_server
+from toy.handlers import ResourceHandler
+from toy.http import Request
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    cache.set(('/a',), 'a')
+    cache.set(('/b',), 'b')
+    assert cache.get(('/a',)) == 'a'
+
+    cache.set(('/c',), 'c')
+
+    assert cache.get(('/b',)) is None
+    assert cache.get(('/a',)) == 'a'
+    assert cache.get(('/c',)) == 'c'
+    assert len(cache) == 2
+
+
+def test_memory_cache_ttl(monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+
+    cache = MemoryCache(ttl=10)
+    cache.set(('/a',), 'a')
+    cache.set(('/b',), 'b', ttl=30)
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 20)
+    assert cache.get(('/a',)) is None
+    assert cache.get(('/b',)) == 'b'
+    assert len(cache) == 1
+
+
+def test_memory_cache_invalidate():
+    cache = MemoryCache()
+    cache.set(('/a', 'page=1'), 1)
+    cache.set(('/a', 'page=2'), 2)
+    cache.set(('/b', ''), 3)
+
+    cache.invalidate('/a', '/c')
+
+    assert cache.get(('/a', 'page=1')) is None
+    assert cache.get(('/a', 'page=2')) is None
+    assert cache.get(('/b', '')) == 3
+
+
+def test_socket_cache(tmp_path):
+    address = str(tmp_path / 'cache.sock')
+    manager = start_cache_server(address, authkey=b'secret', max_entries=2)
+    try:
+        cache = SocketCache(address, authkey=b'secret')
+        other = SocketCache(address, authkey=b'secret')
+
+        cache.set(('/a', ''), b'cached')
+        assert other.get(('/a', '')) == b'cached'
+
+        other.invalidate('/a')
+        assert cache.get(('/a', '')) is None
+    finally:
+        manager.shutdown()
+
+
+def test_memory_cache_skips_values_loaded_before_an_invalidation():
+    cache = MemoryCache()
+    generation = cache.generation()
+    cache.invalidate('/a')
+
+    cache.set(('/a', ''), 'stale', generation=generation)
+    assert cache.get(('/a', '')) is None
+
+    cache.set(('/a', ''), 'fresh', generation=cache.generation())
+    assert cache.get(('/a', '')) == 'fresh'
+
+
+def test_socket_cache_failures(tmp_path, monkeypatch):
+    address = str(tmp_path / 'cache.sock')
+    manager = start_cache_server(address, authkey=b'secret')
+    try:
+        cache = SocketCache(address, authkey=b'wrong')
+        cache.set(('/a', ''), b'cached')
+        assert cache.get(('/a', '')) is None
+
+        cache = SocketCache(address, authkey=b'secret')
+
+        def fail():
+            raise RemoteError('server failure')
+
+        monkeypatch.setattr(cache, '_get_proxy', fail)
+        assert cache.get(('/a', '')) is None
+    finally:
+        manager.shutdown()
+
+
+def test_socket_cache_unavailable(tmp_path):
+    cache = SocketCache(str(tmp_path / 'missing.sock'), authkey=b'secret')
+
+    cache.set(('/a', ''), b'cached')
+    assert cache.get(('/a', '')) is None
+
+
+@pytest.fixture()
+def cached_handler(basic_resource_class):
+    loaded = []
+
+    class MyResource(basic_resource_class):
+        @classmethod
+        def do_get(cls, request=None, application_args=None):
+            loaded.append(request.path)
+            return super().do_get(request, application_args)
+
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get', 'post']
+        resource_type = MyResource
+        response_cache = MemoryCache()
+
+    return MyResourceHandler(), loaded
+
+
+def test_resource_handler_response_cache(envbuilder, cached_handler):
+    handler, loaded = cached_handler
+
+    first = handler(Request(envbuilder('GET', '/items/1')))
+    second = handler(Request(envbuilder('GET', '/items/1')))
+    assert loaded == ['/items/1']
+    assert second.status == 200
+    assert second.body == first.body
+    assert second.headers == first.headers
+
+    handler(Request(envbuilder('GET', '/items/1', query_string='fields=name')))
+    handler(Request(envbuilder('GET', '/items/1', accept='application/x-ndjson')))
+    assert len(loaded) == 3
+
+    environ = envbuilder('GET', '/items/1')
+    environ['HTTP_IF_NONE_MATCH'] = first.headers['ETag']
+    assert handler(Request(environ)).status == 304
+    assert len(loaded) == 3
+
+
+def test_resource_handler_response_cache_invalidation(envbuilder, cached_handler):
+    handler, loaded = cached_handler
+
+    handler(Request(envbuilder('GET', '/items')))
+    handler(Request(envbuilder('GET', '/items/1')))
+
+    body = json.dumps({'name': 'Name'})
+    response = handler(Request(envbuilder('POST', '/items/1/children', input_stream=body)))
+    assert response.status == 400  # failed writes keep the cache
+    handler(Request(envbuilder('GET', '/items/1')))
+    assert loaded == ['/items', '/items/1']
+
+    body = json.dumps({'name': 'Name', 'slug': 'name'})
+    response = handler(Request(envbuilder('POST', '/items/1/children', input_stream=body)))
+    assert response.status == 201
+
+    handler(Request(envbuilder('GET', '/items')))
+    handler(Request(envbuilder('GET', '/items/1')))
+    assert loaded == ['/items', '/items/1', '/items', '/items/1']
+
+
+def test_resource_handler_response_cache_invalidated_while_loading(envbuilder, basic_resource_class):
+    loaded = []
+
+    class MyResource(basic_resource_class):
+        @classmethod
+        def do_get(cls, request=None, application_args=None):
+            loaded.append(request.path)
+            if len(loaded) == 1:
+                MyResourceHandler.response_cache.invalidate('/items/1')  # a write finishing meanwhile
+            return super().do_get(request, application_args)
+
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = MyResource
+        response_cache = MemoryCache()
+
+    handler = MyResourceHandler()
+    for _ in range(3):
+        assert handler(Request(envbuilder('GET', '/items/1'))).status == 200
+
+    assert loaded == ['/items/1', '/items/1']
+
+
+def test_resource_handler_response_cache_without_generation(envbuilder, cached_handler, monkeypatch):
+    handler, loaded = cached_handler
+    monkeypatch.setattr(handler.response_cache, 'generation', lambda: None)  # e.g. cache server unreachable
+
+    handler(Request(envbuilder('GET', '/items/1')))
+    handler(Request(envbuilder('GET', '/items/1')))
+
+    assert loaded == ['/items/1', '/items/1']
+    assert len(handler.response_cache) == 0
@@ -0,0 +1,164 @@
+import gzip
+import json
+
+import pytest
+from webtest import TestApp
+
+from toy.application import Application
+from toy.compression import Compressor, select_encoding
+from toy.handlers import ResourceHandler
+from toy.http import Request, Response, StreamingResponse
+
+PAYLOAD = json.dumps({'recipes': [{'name': f'Recipe #{i}', 'difficulty': 2} for i in range(100)]})
+
+
+@pytest.mark.parametrize(
+    ('accept_encoding', 'encoding'),
+    [
+        ('gzip, deflate', 'gzip'),
+        ('br;q=1.0, gzip;q=0.8', 'br'),
+        ('br;q=0.5, gzip;q=0.8', 'gzip'),
+        ('*', 'br'),
+        ('gzip;q=0, *;q=0.1', 'br'),
+        ('identity', None),
+        ('', None),
+    ],
+)
+def test_select_encoding(accept_encoding, encoding):
+    assert select_encoding(accept_encoding, ('br', 'gzip')) == encoding
+
+
+def _wsgi_get(envbuilder, app, path, accept_encoding=None):
+    # webtest decodes compressed responses, so the application is called directly
+    environ = envbuilder('GET', path)
+    if accept_encoding is not None:
+        environ['HTTP_ACCEPT_ENCODING'] = accept_encoding
+
+    started = {}
+    body = app(environ, lambda status, headers: started.update(headers))
+    return started, b''.join(body)
+
+
+@pytest.fixture()
+def compressed_app():
+    app = Application(compression=Compressor(min_size=100))
+    app.add_route(r'^/large$', lambda request: Response(PAYLOAD, content_type='application/json; charset=utf-8'))
+    app.add_route(r'^/small$', lambda request: Response('{}', content_type='application/json; charset=utf-8'))
+    app.add_route(r'^/binary$', lambda request: Response(b'0' * 1000, content_type='image/png'))
+    return app
+
+
+def test_compress_response(envbuilder, compressed_app):
+    headers, body = _wsgi_get(envbuilder, compressed_app, '/large', 'gzip')
+
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert int(headers['Content-Length']) == len(body) < len(PAYLOAD)
+    assert gzip.decompress(body).decode('utf-8') == PAYLOAD
+
+
+def test_skip_response_compression(compressed_app):
+    client = TestApp(compressed_app)
+
+    response = client.get('/large')
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.body == b'{}'
+
+    response = client.get('/binary', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers
+
+
+def test_compress_streaming_response(envbuilder, compressed_app, asgi_call):
+    def export(request):
+        return StreamingResponse((f'line {i}\n' for i in range(3)), content_type='text/plain; charset=utf-8')
+
+    compressed_app.add_route(r'^/export$', export)
+
+    headers, body = _wsgi_get(envbuilder, compressed_app, '/export', 'gzip')
+    assert headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in headers
+    assert gzip.decompress(body) == b'line 0\nline 1\nline 2\n'
+
+    status, headers, body = asgi_call(compressed_app.asgi, 'GET', '/export', headers={'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(body) == b'line 0\nline 1\nline 2\n'
+
+
+def test_compression_cache(envbuilder):
+    compressor = Compressor(min_size=0, cache_size=1)
+    request = Request({**envbuilder('GET', '/'), 'HTTP_ACCEPT_ENCODING': 'gzip'})
+
+    first = compressor.compress(request, Response(PAYLOAD, content_type='text/plain'))
+    second = compressor.compress(request, Response(PAYLOAD, content_type='text/plain'))
+    other = compressor.compress(request, Response('other', content_type='text/plain'))
+
+    assert first.body is second.body
+    assert gzip.decompress(other.body) == b'other'
+    assert len(compressor._cache) == 1
+
+
+def test_brotli_compression(envbuilder):
+    brotli = pytest.importorskip('brotli')
+    request = Request({**envbuilder('GET', '/'), 'HTTP_ACCEPT_ENCODING': 'br, gzip'})
+
+    response = Compressor(min_size=0).compress(request, Response(PAYLOAD, content_type='text/plain'))
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.body).decode('iso-8859-1') == PAYLOAD
+
+
+def test_compression_weakens_etag(envbuilder):
+    request = Request({**envbuilder('GET', '/'), 'HTTP_ACCEPT_ENCODING': 'gzip'})
+    response = Response(PAYLOAD, content_type='text/plain', headers={'ETag': '"abc"'})
+
+    response = Compressor(min_size=0).compress(request, response)
+
+    assert response.headers['ETag'] == 'W/"abc"'
+
+
+def test_not_modified_response_repeats_compressed_validators(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = basic_resource_class
+
+    app = Application(compression=Compressor(min_size=0))
+    app.add_route(r'^/resource$', MyResourceHandler())
+
+    headers, _ = _wsgi_get(envbuilder, app, '/resource', 'gzip')
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['ETag'].startswith('W/')
+
+    environ = {**envbuilder('GET', '/resource'), 'HTTP_ACCEPT_ENCODING': 'gzip', 'HTTP_IF_NONE_MATCH': headers['ETag']}
+    started = {}
+    body = b''.join(app(environ, lambda status, response_headers: started.update(response_headers, status=status)))
+
+    assert started['status'].startswith('304')
+    assert started['ETag'] == headers['ETag']
+    assert started['Vary'] == 'Accept-Encoding'
+    assert body == b''
+
+
+def test_not_modified_response_repeats_uncompressed_validators(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = basic_resource_class
+
+    app = Application(compression=Compressor(min_size=64 * 1024))  # too small to be compressed
+    app.add_route(r'^/resource$', MyResourceHandler())
+
+    headers, _ = _wsgi_get(envbuilder, app, '/resource', 'gzip')
+    assert 'Content-Encoding' not in headers
+    assert not headers['ETag'].startswith('W/')
+
+    environ = {**envbuilder('GET', '/resource'), 'HTTP_ACCEPT_ENCODING': 'gzip', 'HTTP_IF_NONE_MATCH': headers['ETag']}
+    started = {}
+    b''.join(app(environ, lambda status, response_headers: started.update(response_headers, status=status)))
+
+    assert started['status'].startswith('304')
+    assert started['ETag'] == headers['ETag']
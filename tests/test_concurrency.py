@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from toy import concurrency
+
+
+def sync_function(value):
+    return value * 2
+
+
+async def async_function(value):
+    await asyncio.sleep(0)
+    return value * 3
+
+
+@concurrency.portable
+async def portable_function(value):
+    double = await concurrency.call(sync_function, value)
+    triple = await concurrency.call(async_function, value)
+    return threading.current_thread().name, double + triple
+
+
+def test_is_async_callable():
+    class AsyncCallable:
+        async def __call__(self):
+            pass  # pragma: nocover
+
+    assert concurrency.is_async_callable(async_function)
+    assert concurrency.is_async_callable(AsyncCallable())
+    assert not concurrency.is_async_callable(sync_function)
+    assert not concurrency.is_async_callable(AsyncCallable)
+
+
+def test_run_sync():
+    assert concurrency.run_sync(sync_function, 2) == 4
+    assert concurrency.run_sync(async_function, 2) == 6
+
+
+def test_run_sync_drives_portable_coroutines_in_calling_thread():
+    thread_name, result = concurrency.run_sync(portable_function, 2)
+
+    assert thread_name == threading.current_thread().name
+    assert result == 10
+
+
+def test_fail_run_sync_portable_coroutine_awaiting_directly():
+    @concurrency.portable
+    async def not_portable():
+        await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        concurrency.run_sync(not_portable)
+
+
+def test_fail_run_sync_inside_event_loop():
+    async def main():
+        concurrency.run_sync(sync_function, 1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+
+
+def test_run_async():
+    async def main():
+        main_thread = threading.current_thread().name
+        sync_thread = await concurrency.run_async(lambda: threading.current_thread().name)
+        return (
+            await concurrency.run_async(sync_function, 2),
+            await concurrency.run_async(async_function, 2),
+            await concurrency.run_async(portable_function, 2),
+            sync_thread != main_thread,
+        )
+
+    double, triple, (thread_name, result), off_loop = asyncio.run(main())
+
+    assert double == 4
+    assert triple == 6
+    assert result == 10
+    assert off_loop is True
+
+
+def test_then():
+    assert concurrency.then(2, sync_function) == 4
+    assert asyncio.run(concurrency.then(async_function(2), sync_function)) == 12
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_single_flight_threads():
+    flight = concurrency.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def load(value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(concurrency.run_sync(flight.do, 'key', load, 2)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+
+    _wait_for(lambda: flight.coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [2]
+    assert results == [4, 4, 4, 4]
+    assert (flight.leaders, flight.coalesced, flight.in_flight) == (1, 3, 0)
+
+    assert concurrency.run_sync(flight.do, 'key', sync_function, 3) == 6
+    assert flight.leaders == 2
+
+
+def test_single_flight_async():
+    flight = concurrency.SingleFlight()
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 3
+
+    async def main():
+        return await asyncio.gather(*(flight.do('key', load, 2) for _ in range(3)), flight.do('other', load, 1))
+
+    assert asyncio.run(main()) == [6, 6, 6, 3]
+    assert calls == [2, 1]
+    assert (flight.leaders, flight.coalesced) == (2, 2)
+
+
+def test_single_flight_shares_exceptions():
+    flight = concurrency.SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('failed')
+
+    async def main():
+        return await asyncio.gather(flight.do('key', fail), flight.do('key', fail), return_exceptions=True)
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, ValueError)
+    assert second is first
+    assert flight.in_flight == 0
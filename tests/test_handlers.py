@@ -1,12 +1,17 @@
+import asyncio
 import json
+import threading
+import time
+from datetime import datetime, timezone
 from unittest.mock import Mock
 
 import pytest
 from staty import MethodNotAllowedException
 
+from toy import concurrency
 from toy.exceptions import UnauthorizedException
 from toy.handlers import Handler, ResourceHandler
-from toy.http import Request
+from toy.http import Request, Response, StreamingResponse
 
 
 def test_basic_handler_arguments():
@@ -59,7 +64,7 @@ def test_basic_resource_handler_creation(envbuilder, basic_resource_class, json_
     response = handler(request)
 
     assert response.status == 201
-    assert response.data == json_data
+    assert response.data == json_data.encode()
     assert response.headers['Location'] == '/my-name'
 
 
@@ -87,7 +92,7 @@ def test_bad_request_resource_handler_creation_missing_required_argument(envbuil
 
     response = handler(request)
     assert response.status.code == 400
-    assert response.data == expected_error
+    assert response.data == expected_error.encode()
 
 
 def test_resource_handler_route_resolver(basic_resource_class):
@@ -137,3 +142,265 @@ def test_authenticate_header():
 
     error = UnauthorizedException('basic', 'Access to the staging site', charset=True)
     assert error.header == 'Basic realm="Access to the staging site", charset="UTF-8"'
+
+
+@pytest.fixture()
+def async_resource_class(basic_resource_class):
+    class MyAsyncResource(basic_resource_class):
+        created = []
+
+        @classmethod
+        async def do_get(cls, request=None, application_args=None):
+            await asyncio.sleep(0)
+            resource = cls(request=request, application_args=application_args)
+            resource.update({'name': 'Async Name', 'slug': 'async-name'})
+            return resource
+
+        async def do_create(self, parent_resource=None):
+            await asyncio.sleep(0)
+            self.created.append(self['slug'])
+
+    return MyAsyncResource
+
+
+@pytest.fixture()
+def async_resource_handler(async_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get', 'post']
+        resource_type = async_resource_class
+        route_template = '/<slug>'
+
+    return MyResourceHandler()
+
+
+def test_async_resource_handler_get(envbuilder, async_resource_handler):
+    request = Request(envbuilder('GET', '/'))
+
+    response = async_resource_handler(request)
+
+    assert response.status == 200
+    assert json.loads(response.data) == {'name': 'Async Name', 'description': None, 'slug': 'async-name'}
+
+
+def test_async_resource_handler_post(envbuilder, async_resource_handler, async_resource_class, json_data):
+    request = Request(envbuilder('POST', '/', input_stream=json_data))
+
+    response = async_resource_handler(request)
+
+    assert response.status == 201
+    assert response.headers['Location'] == '/my-name'
+    assert async_resource_class.created == ['my-name']
+
+
+def test_async_resource_handler_under_asgi(application, async_resource_handler, asgi_call):
+    application.add_route(r'^/async$', async_resource_handler)
+
+    status, _, body = asgi_call(application.asgi, 'GET', '/async', headers={'Accept': 'application/json'})
+
+    assert status == 200
+    assert json.loads(body) == {'name': 'Async Name', 'description': None, 'slug': 'async-name'}
+
+
+def test_async_handler_methods(application, asgi_call, envbuilder):
+    class AsyncHandler(Handler):
+        allowed_methods = ['get']
+
+        async def get(self, request):
+            await asyncio.sleep(0)
+            return Response('Hello async!', content_type='text/plain; charset=utf-8')
+
+    application.add_route(r'^/async$', AsyncHandler())
+
+    response = application.call_handler(Request(envbuilder('GET', '/async')))
+    assert response.data == 'Hello async!'
+
+    status, _, body = asgi_call(application.asgi, 'GET', '/async')
+    assert status == 200
+    assert body == b'Hello async!'
+
+
+def test_streaming_resource_handler_get(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = basic_resource_class
+        streaming = True
+
+    request = Request(envbuilder('GET', '/'))
+    response = MyResourceHandler()(request)
+
+    assert isinstance(response, StreamingResponse)
+    assert json.loads(b''.join(response)) == {'name': 'My Name', 'description': 'My Description', 'slug': 'my-name'}
+
+
+def test_bulk_resource_handler_creation(envbuilder, basic_resource_class):
+    batches = []
+
+    class MyResource(basic_resource_class):
+        @classmethod
+        def do_bulk_create(cls, resources, request=None, application_args=None):
+            batches.append(len(resources))
+
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['post']
+        resource_type = MyResource
+        bulk = True
+
+    items = [{'name': f'Name {i}', 'slug': f'name-{i}'} for i in range(3)]
+    request = Request(envbuilder('POST', '/', input_stream=json.dumps(items)))
+
+    response = MyResourceHandler()(request)
+
+    assert response.status == 201
+    assert [item['slug'] for item in json.loads(response.data)] == ['name-0', 'name-1', 'name-2']
+    assert batches == [3]
+
+
+def test_bulk_resource_handler_default_creation(envbuilder, async_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['post']
+        resource_type = async_resource_class
+        bulk = True
+
+    items = [{'name': 'First', 'slug': 'first'}, {'name': 'Second', 'slug': 'second'}]
+    request = Request(envbuilder('POST', '/', input_stream=json.dumps(items)))
+
+    response = MyResourceHandler()(request)
+
+    assert response.status == 201
+    assert async_resource_class.created == ['first', 'second']
+
+
+def test_bad_request_bulk_resource_handler_creation(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['post']
+        resource_type = basic_resource_class
+        bulk = True
+
+    items = [{'name': 'First', 'slug': 'first'}, {'description': 'Missing name'}]
+    request = Request(envbuilder('POST', '/', input_stream=json.dumps(items)))
+
+    response = MyResourceHandler()(request)
+
+    assert response.status.code == 400
+    assert json.loads(response.data) == {'errors': [{'field': '1.name', 'message': 'Required field'}]}
+
+
+def test_bulk_resource_handler_disabled(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['post']
+        resource_type = basic_resource_class
+
+    request = Request(envbuilder('POST', '/', input_stream=json.dumps([{'name': 'Name', 'slug': 'name'}])))
+
+    response = MyResourceHandler()(request)
+
+    assert response.status.code == 400
+
+
+def test_bulk_resource_handler_ndjson_creation(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['post']
+        resource_type = basic_resource_class
+        bulk = True
+
+    body = '{"name": "First", "slug": "first"}\n{"name": "Second", "slug": "second"}\n'
+    request = Request(envbuilder('POST', '/', input_stream=body, content_type='application/x-ndjson'))
+
+    response = MyResourceHandler()(request)
+
+    assert response.status == 201
+    assert [item['slug'] for item in json.loads(response.data)] == ['first', 'second']
+
+
+def test_resource_handler_conditional_get(envbuilder, basic_resource_class):
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = basic_resource_class
+
+    response = MyResourceHandler()(Request(envbuilder('GET', '/')))
+    etag = response.headers['ETag']
+    assert response.status == 200
+
+    environ = envbuilder('GET', '/')
+    environ['HTTP_IF_NONE_MATCH'] = f'"other", {etag}'
+    response = MyResourceHandler()(Request(environ))
+
+    assert response.status == 304
+    assert response.headers == {'ETag': etag}
+    assert response.body == b''
+
+
+def test_resource_handler_conditional_get_with_version(envbuilder, basic_resource_class):
+    loaded = []
+
+    class MyResource(basic_resource_class):
+        @classmethod
+        def do_get_version(cls, request=None, application_args=None):
+            return datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        @classmethod
+        def do_get(cls, request=None, application_args=None):
+            loaded.append(True)
+            return super().do_get(request, application_args)
+
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = MyResource
+
+    response = MyResourceHandler()(Request(envbuilder('GET', '/')))
+    assert response.status == 200
+    assert response.headers['Last-Modified'] == 'Thu, 02 Jan 2020 03:04:05 GMT'
+    assert loaded == [True]
+
+    environ = envbuilder('GET', '/')
+    environ['HTTP_IF_NONE_MATCH'] = response.headers['ETag']
+    assert MyResourceHandler()(Request(environ)).status == 304
+
+    environ = envbuilder('GET', '/')
+    environ['HTTP_IF_MODIFIED_SINCE'] = 'Thu, 02 Jan 2020 03:04:05 GMT'
+    assert MyResourceHandler()(Request(environ)).status == 304
+
+    environ = envbuilder('GET', '/', accept='application/x-ndjson')
+    environ['HTTP_IF_NONE_MATCH'] = response.headers['ETag']  # other representation
+    assert MyResourceHandler()(Request(environ)).status == 200
+
+    assert loaded == [True, True]
+
+
+def test_resource_handler_single_flight(envbuilder, basic_resource_class):
+    release = threading.Event()
+    loaded = []
+
+    class MyResource(basic_resource_class):
+        @classmethod
+        def do_get(cls, request=None, application_args=None):
+            loaded.append(request.path)
+            release.wait(5)
+            return super().do_get(request, application_args)
+
+    class MyResourceHandler(ResourceHandler):
+        allowed_methods = ['get']
+        resource_type = MyResource
+        single_flight = concurrency.SingleFlight()
+
+    handler = MyResourceHandler()
+    responses = []
+    threads = [
+        threading.Thread(target=lambda: responses.append(handler(Request(envbuilder('GET', '/items/1')))))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + 5
+    while handler.single_flight.coalesced < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert loaded == ['/items/1']
+    assert [response.status for response in responses] == [200, 200, 200]
+    assert len({id(response.headers) for response in responses}) == 3
+    assert responses[0].body == responses[1].body == responses[2].body
@@ -1,10 +1,11 @@
+from datetime import datetime
 from io import BytesIO
 
 import pytest
 from accept import MediaType
-from staty import NoContent, Ok
+from staty import NoContent, NotModified, Ok, PayloadTooLargeException
 
-from toy.http import Request, Response, to_title_case
+from toy.http import Headers, Request, Response, StreamingResponse, WSGIResponse, make_etag, to_title_case
 
 
 @pytest.mark.parametrize(
@@ -84,6 +85,34 @@ def test_response_with_different_content_type():
     assert response.content_stream.read() == BytesIO(b'Hello world!').read()
 
 
+def test_response_bytes_body():
+    data = b'Ol\xe1 mundo!'
+    response = Response(data, content_type='text/plain; charset=iso-8859-1')
+
+    assert response.body is data
+    assert response.content_length == 10
+
+
+def test_response_memoryview_body():
+    response = Response(memoryview(b'Hello world!'))
+    wsgi_response = WSGIResponse(response)
+
+    assert response.content_length == 12
+    assert wsgi_response.body == [b'Hello world!']
+    assert ('Content-Length', '12') in wsgi_response.headers
+
+
+def test_response_body_encoded_once():
+    response = Response('Olá mundo!', content_type='text/plain; charset=utf-8')
+
+    assert response.body is response.body
+    assert response.content_length == 11
+
+    response.data = 'Hello!'
+    assert response.body == b'Hello!'
+    assert response.content_length == 6
+
+
 def test_response_with_no_content_status():
     response = Response('', status=NoContent(), content_type='text/plain; charset=utf-8')
     assert response.data is None
@@ -96,3 +125,174 @@ def test_response_with_no_content_status():
 def test_response_with_extra_http_headers():
     response = Response('', ignored_arg='', http_www_authenticate='Basic realm="Test Endpoint"')
     assert response.headers['WWW-Authenticate'] == 'Basic realm="Test Endpoint"'
+
+
+def test_headers_case_insensitive():
+    headers = Headers({'Content-Type': 'application/json'})
+    headers['www-authenticate'] = 'Basic'
+
+    assert headers['content-type'] == 'application/json'
+    assert headers['CONTENT-TYPE'] == 'application/json'
+    assert headers.get('WWW-Authenticate') == 'Basic'
+    assert 'Content-type' in headers
+    assert list(headers) == ['Content-Type', 'www-authenticate']
+    assert headers == {'Content-Type': 'application/json', 'www-authenticate': 'Basic'}
+
+    del headers['CONTENT-TYPE']
+    assert len(headers) == 1
+
+
+def test_http_request_headers_are_lazy(envbuilder):
+    request = Request(envbuilder('GET', '/', authorization='Basic token'))
+
+    assert request.get_header('Authorization') == 'Basic token'
+    assert request.get_header('authorization') == 'Basic token'
+    assert request.get_header('Content-Length') == '0'
+    assert request.get_header('X-Missing', 'default') == 'default'
+    assert request.accept == [MediaType('application/json')]
+    assert 'headers' not in request.__dict__
+
+    assert request.headers['authorization'] == 'Basic token'
+    request.headers['X-Custom'] = 'value'
+    assert request.get_header('x-custom') == 'value'
+
+
+def test_http_request_accept_defaults_to_content_type():
+    request = Request({'CONTENT_TYPE': 'text/plain; charset=utf-8', 'wsgi.input': BytesIO()})
+
+    assert request.accept == [MediaType('text/plain')]
+    assert request.accept_charset == [MediaType('utf-8')]
+    assert request.content_length == 0
+
+
+def test_http_request_invalid_content_length():
+    request = Request({'CONTENT_LENGTH': 'invalid', 'wsgi.input': BytesIO()})
+    assert request.content_length == 0
+
+
+def test_http_request_iter_body(envbuilder):
+    request = Request(envbuilder('POST', '/', input_stream=b'0123456789'))
+
+    assert list(request.iter_body(chunk_size=4)) == [b'0123', b'4567', b'89']
+    assert list(request.iter_body(chunk_size=4)) == []
+
+
+def test_http_request_readinto(envbuilder):
+    request = Request(envbuilder('POST', '/', input_stream=b'0123456789'))
+    buffer = bytearray(4)
+
+    chunks = []
+    while size := request.readinto(buffer):
+        chunks.append(bytes(buffer[:size]))
+
+    assert chunks == [b'0123', b'4567', b'89']
+
+
+def test_http_request_body_is_cached(envbuilder):
+    request = Request(envbuilder('POST', '/', input_stream=b'Test'))
+
+    assert request.body == b'Test'
+    assert request.data == 'Test'
+    assert list(request.iter_body()) == [b'Test']
+
+
+def test_fail_http_request_body_too_large(envbuilder):
+    request = Request(envbuilder('POST', '/', input_stream=b'0123456789'), max_body_size=5)
+
+    with pytest.raises(PayloadTooLargeException):
+        list(request.iter_body())
+
+    with pytest.raises(PayloadTooLargeException):
+        request.readinto(bytearray(4))
+
+    assert request.content_stream.tell() == 0
+
+
+def test_streaming_response_chunks():
+    response = StreamingResponse(iter([b'Hello', '', ' world!']), content_type='text/plain; charset=utf-8')
+
+    assert repr(response) == '<StreamingResponse 200 OK>'
+    assert list(response) == [b'Hello', b' world!']
+
+
+def test_streaming_response_file():
+    response = StreamingResponse(BytesIO(b'Hello world!'), block_size=5)
+
+    assert response.is_file
+    assert list(response) == [b'Hello', b' worl', b'd!']
+
+
+def test_streaming_response_async_iterable():
+    async def chunks():
+        yield b'Hello'
+        yield ' world!'
+
+    response = StreamingResponse(chunks())
+
+    assert list(response) == [b'Hello', b' world!']
+
+
+def test_wsgi_streaming_response_body():
+    closed = []
+
+    def chunks():
+        try:
+            yield b'Hello'
+            yield b' world!'
+        finally:
+            closed.append(True)
+
+    body = WSGIResponse(StreamingResponse(chunks())).body
+    assert list(body) == [b'Hello', b' world!']
+
+    body.close()
+    assert closed == [True]
+
+
+def test_wsgi_streaming_response_file_wrapper():
+    content = BytesIO(b'Hello world!')
+    environ = {'wsgi.file_wrapper': lambda f, block_size: ('wrapped', f, block_size)}
+
+    body = WSGIResponse(StreamingResponse(content, block_size=5), environ).body
+
+    assert body == ('wrapped', content, 5)
+
+
+def test_wsgi_streaming_response_without_content_length():
+    headers = WSGIResponse(StreamingResponse(iter([b'Hello']))).headers
+
+    assert not any(key == 'Content-Length' for key, _ in headers)
+
+
+def test_make_etag():
+    assert make_etag(b'body') == make_etag(b'body')
+    assert make_etag(b'body') != make_etag(b'other')
+    assert make_etag(1, 'application/json').startswith('"')
+    assert make_etag(1, weak=True).startswith('W/"')
+
+
+@pytest.mark.parametrize(
+    ('headers', 'fresh'),
+    [
+        ({}, False),
+        ({'HTTP_IF_NONE_MATCH': '"a"'}, True),
+        ({'HTTP_IF_NONE_MATCH': 'W/"a"'}, True),
+        ({'HTTP_IF_NONE_MATCH': '"b", "c"'}, False),
+        ({'HTTP_IF_NONE_MATCH': '*'}, True),
+        ({'HTTP_IF_MODIFIED_SINCE': 'Thu, 02 Jan 2020 03:04:05 GMT'}, True),
+        ({'HTTP_IF_MODIFIED_SINCE': 'Thu, 02 Jan 2020 03:04:04 GMT'}, False),
+        ({'HTTP_IF_MODIFIED_SINCE': 'invalid'}, False),
+        ({'HTTP_IF_NONE_MATCH': '"b"', 'HTTP_IF_MODIFIED_SINCE': 'Thu, 02 Jan 2020 03:04:05 GMT'}, False),
+    ],
+)
+def test_http_request_is_fresh(envbuilder, headers, fresh):
+    request = Request({**envbuilder('GET', '/'), **headers})
+
+    assert request.is_fresh('"a"', datetime(2020, 1, 2, 3, 4, 5, 600)) is fresh
+
+
+def test_not_modified_response():
+    response = Response('', status=NotModified(), content_type=None, headers={'ETag': '"a"'})
+
+    assert response.body == b''
+    assert WSGIResponse(response).headers == [('ETag', '"a"')]
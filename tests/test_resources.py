@@ -1,7 +1,10 @@
+import json
+
 import pytest
 
 from toy import fields
 from toy.exceptions import ValidationException
+from toy.handlers import ErrorResponseResource
 from toy.resources import Processor, Resource
 
 
@@ -47,6 +50,85 @@ def test_fail_duplicated_field():
         MyResource()
 
 
+def test_resource_schema_shared_between_instances(composite_resource_class):
+    first = composite_resource_class(name='First', items=[{'name': 'Item'}])
+    second = composite_resource_class(name='Second')
+
+    schema = composite_resource_class.get_schema()
+    assert schema is composite_resource_class.get_schema()
+    assert schema.names == ('name', 'sub_item', 'items')
+    assert schema.fields[0] is composite_resource_class.fields[0]
+
+    assert first['name'] == 'First'
+    assert second['name'] == 'Second'
+    assert len(first['items']) == 1
+    assert second['items'] == []
+    assert schema.fields[2].value == []  # schema fields never hold resource values
+
+
+def test_resource_schema_not_inherited(basic_resource_class):
+    class ChildResource(basic_resource_class):
+        fields = [*basic_resource_class.fields, fields.BooleanField(name='active')]
+
+    basic_resource_class.get_schema()
+
+    assert ChildResource.get_schema().names == ('name', 'description', 'slug', 'active')
+    assert ChildResource().keys(include_lazy=False) == {'name', 'description', 'active'}
+
+
+def test_resource_dirty_fields(basic_resource_class):
+    resource = basic_resource_class(name='Name')
+    assert resource.dirty == {'name'}
+
+    resource.clean()
+    assert resource.dirty == set()
+
+    resource['name'] = 'Name'
+    assert resource.dirty == set()
+
+    resource.update({'slug': 'slug', 'unknown': 'extra'})
+    assert resource.dirty == {'slug'}
+
+
+def test_resource_slots():
+    class MyResource(Resource):
+        __slots__ = ()
+
+        fields = [fields.CharField(name='name', max_length=255)]
+
+    resource = MyResource(name='My Name')
+
+    assert not hasattr(resource, '__dict__')
+    with pytest.raises(AttributeError):
+        resource.other = 'value'
+
+
+def test_validate_many_resources(basic_resource_class):
+    items = [
+        {'name': 'First', 'slug': 'first'},
+        {'name': 'X' * 256, 'unknown': 'extra'},
+        'invalid',
+    ]
+
+    resources, errors = basic_resource_class.validate_many(items, include_lazy=False)
+
+    assert resources[0]['name'] == 'First'
+    assert resources[2] is None
+    assert sorted(errors) == ['1.name', '1.unknown', '2']
+    assert errors['1.name'][0].message == 'Invalid max length'
+
+    error_resource = ErrorResponseResource()
+    error_resource.update(errors)
+    assert {'field': '2', 'message': 'Invalid resource data'} in error_resource.data['errors']
+
+
+def test_fail_validate_many_resources(basic_resource_class):
+    with pytest.raises(ValidationException) as exc_info:
+        basic_resource_class.validate_many([{'name': 'Name'}], raise_exception=True)
+
+    assert exc_info.value.errors['0.slug'][0].message == 'Required field'
+
+
 def test_processor_get_data(post_request):
     processor = Processor(post_request)
     data = processor.get_data()
@@ -60,7 +142,7 @@ def test_processor_get_response(post_request, json_data):
     response = processor.get_response(processor.get_data())
 
     assert response.status == 200
-    assert response.data == json_data
+    assert response.data == json_data.encode()
 
 
 def test_validate_resource_all_fields(basic_resource_class):
@@ -205,3 +287,20 @@ def test_compound_resource_data_dump(compound_resource):
     item = data['items'][2]
     assert isinstance(item, dict)
     assert item['name'] == 'My Resource Item #3'
+
+
+def test_resource_iter_data(compound_resource):
+    data = dict(compound_resource.iter_data())
+
+    assert data['name'] == 'My Resource'
+    assert data['sub_item'] is compound_resource['sub_item']
+    assert data['items'] is compound_resource['items']
+
+
+def test_processor_get_streaming_response(post_request, compound_resource):
+    processor = Processor(post_request)
+    response = processor.get_streaming_response(compound_resource)
+
+    assert response.status == 200
+    assert response.headers['Content-Type'] == 'application/json; charset=iso-8859-1'
+    assert b''.join(response) == json.dumps(compound_resource.data).encode('iso-8859-1')
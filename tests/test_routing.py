@@ -3,7 +3,7 @@ import re
 import pytest
 
 from toy.exceptions import InvalidRouteHandlerException
-from toy.routing import Route, Routes
+from toy.routing import Route, RouteMatch, Routes, static_prefix
 
 
 def test_basic_route(handler):
@@ -13,16 +13,30 @@ def test_basic_route(handler):
     assert route.pattern == re.compile(r'^/$')
     assert route.handler == handler
     assert repr(route) == '<Route ^/$ function>'
-    assert route.match('/') == {}
-    assert route.path_arguments == {}
+    assert route.match('/') == RouteMatch(route, {})
+    assert route.match('/').handler == handler
+    assert route.match('/').path_arguments == {}
     assert route.match('/dont-match') is None
 
 
 def test_route_with_args(handler):
     route = Route(r'^/(?P<arg>.*)$', handler)
 
-    assert route.match('/') == {'arg': ''}
-    assert route.match('/value') == {'arg': 'value'}
+    assert route.match('/').path_arguments == {'arg': ''}
+    assert route.match('/value').path_arguments == {'arg': 'value'}
+
+
+def test_route_match_arguments_are_per_request(handler):
+    route = Route(r'^/(?P<first>[^/]+)(/(?P<second>.+))?$', handler)
+
+    first = route.match('/one/two')
+    second = route.match('/three')
+
+    assert first.path_arguments == {'first': 'one', 'second': 'two'}
+    assert second.path_arguments == {'first': 'three', 'second': None}
+
+    with pytest.raises(TypeError):
+        first.path_arguments['first'] = 'changed'
 
 
 def test_error_route_with_not_callable_handler():
@@ -58,10 +72,10 @@ def test_match_route_in_routes(handler):
     routes.add_route(r'^/$', handler)
     routes.add_route(r'^/(?P<arg>.+)$', handler)
 
-    assert routes.match('/')[0].path == r'^/$'
+    assert routes.match('/')[0].route.path == r'^/$'
 
     match = routes.match('/resources')[0]
-    assert match.path == r'^/(?P<arg>.+)$'
+    assert match.route.path == r'^/(?P<arg>.+)$'
     assert match.path_arguments == {'arg': 'resources'}
 
 
@@ -70,8 +84,8 @@ def test_match_multople_routes_in_routes(handler):
     routes.add_route(r'^/$', handler)
     routes.add_route(r'^/(?P<arg>.*)$', handler)
 
-    assert routes.match('/')[0].path == r'^/$'
-    assert routes.match('/')[1].path == r'^/(?P<arg>.*)$'
+    assert routes.match('/')[0].route.path == r'^/$'
+    assert routes.match('/')[1].route.path == r'^/(?P<arg>.*)$'
 
 
 def test_fail_add_same_route_twice(handler):
@@ -80,3 +94,59 @@ def test_fail_add_same_route_twice(handler):
 
     with pytest.raises(ValueError):
         routes.add_route(r'/', handler)
+
+
+@pytest.mark.parametrize(
+    ('path', 'prefix'),
+    [
+        (r'^/$', '/'),
+        (r'^/recipes$', '/recipes'),
+        (r'^/recipes/(?P<id>[0-9a-f-]+)$', '/recipes/'),
+        (r'^/recipes/(?P<id>[0-9a-f-]+)/rating$', '/recipes/'),
+        (r'^/files\.json$', '/files.json'),
+        (r'^/items?$', '/item'),
+        (r'^/\d+$', '/'),
+        (r'^/a|/b$', None),
+        (r'^/(a|b)$', '/'),
+        (r'/recipes', None),
+    ],
+)
+def test_route_static_prefix(path, prefix):
+    assert static_prefix(path) == prefix
+
+
+def test_match_routes_candidates_in_registration_order(handler):
+    routes = Routes()
+    routes.add_route(r'^/recipes/(?P<id>[0-9a-f-]+)/rating$', handler)
+    routes.add_route(r'rating$', handler)
+    routes.add_route(r'^/recipes$', handler)
+    routes.add_route(r'^/recipes/(?P<id>[0-9a-f-]+)$', handler)
+    routes.add_route(r'^/', handler)
+
+    assert [r.path for r in routes.candidates('/recipes/abc/rating')] == [
+        r'^/recipes/(?P<id>[0-9a-f-]+)/rating$',
+        r'rating$',
+        r'^/recipes$',
+        r'^/recipes/(?P<id>[0-9a-f-]+)$',
+        r'^/',
+    ]
+    assert [r.path for r in routes.candidates('/other')] == [r'rating$', r'^/']
+
+    assert [m.route.path for m in routes.match('/recipes/abc/rating')] == [
+        r'^/recipes/(?P<id>[0-9a-f-]+)/rating$',
+        r'rating$',
+        r'^/',
+    ]
+    assert [m.route.path for m in routes.match('/recipes')] == [r'^/recipes$', r'^/']
+
+
+def test_match_routes_sharing_prefixes(handler):
+    routes = Routes()
+    routes.add_route(r'^/recipes-archive$', handler)
+    routes.add_route(r'^/recipes$', handler)
+    routes.add_route(r'^/rec$', handler)
+
+    assert [m.route.path for m in routes.match('/recipes')] == [r'^/recipes$']
+    assert [m.route.path for m in routes.match('/recipes-archive')] == [r'^/recipes-archive$']
+    assert [m.route.path for m in routes.match('/rec')] == [r'^/rec$']
+    assert routes.match('/re') == []
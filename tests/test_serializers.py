@@ -1,6 +1,23 @@
+import json
+
 import pytest
 
-from toy.serializers import JSONSerializer, Serializer, SerializersManager
+from toy.exceptions import SerializationException, UnsupportedMediaTypeException
+from toy.http import Request
+from toy.resources import Processor, Resource
+from toy.serializers import (
+    BinarySerializer,
+    CBORSerializer,
+    JSONBackend,
+    JSONSerializer,
+    MessagePackSerializer,
+    NDJSONSerializer,
+    PassThroughSerializer,
+    Serializer,
+    SerializersManager,
+    get_json_backend,
+    serializers,
+)
 
 
 def test_basic_json_processor():
@@ -35,3 +52,195 @@ def test_fail_processor_manager_register_no_content_type():
 
     with pytest.raises(ValueError):
         manager.register(Serializer)
+
+
+def test_serializer_manager_negotiate():
+    manager = SerializersManager()
+    manager.register(JSONSerializer)
+
+    content_type, serializer, charset = manager.negotiate('text/html;q=0.5, application/json', 'utf-8')
+    assert content_type == 'application/json'
+    assert isinstance(serializer, JSONSerializer)
+    assert charset == 'utf-8'
+
+    assert manager.negotiate('application/json', 'unknown-charset, utf-16;q=0.5')[2] == 'utf-16'
+    assert manager.negotiate('application/json', '*')[2] == 'iso-8859-1'
+
+
+def test_serializer_manager_negotiation_cache():
+    manager = SerializersManager(negotiation_cache_size=2)
+    manager.register(JSONSerializer)
+
+    manager.negotiate('application/json', 'utf-8')
+    manager.negotiate('application/json', 'utf-8')
+    manager.negotiate('application/json', 'iso-8859-1')
+
+    info = manager.negotiation_cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+    assert info.currsize == 2
+
+    manager.register(PassThroughSerializer)
+    assert manager.negotiation_cache_info().currsize == 0
+
+
+def test_fail_serializer_manager_negotiate_unsupported_media_type():
+    manager = SerializersManager()
+    manager.register(JSONSerializer)
+
+    with pytest.raises(UnsupportedMediaTypeException) as exc_info:
+        manager.negotiate('text/html', 'utf-8')
+    assert exc_info.value.media_type == 'text/html'
+
+    with pytest.raises(UnsupportedMediaTypeException):
+        manager.negotiate('text/html', 'utf-8')
+
+
+def test_json_processor_load_stream():
+    processor = JSONSerializer()
+
+    assert processor.load_stream([b'{"obj": ', b'"value"}'], 'iso-8859-1') == {'obj': 'value'}
+    assert processor.load_stream(['{"obj": "é"}'.encode('utf-8')], 'utf-8') == {'obj': 'é'}
+    assert processor.load_stream(['{"obj": "é"}'.encode('iso-8859-1')], 'iso-8859-1') == {'obj': 'é'}
+
+    with pytest.raises(SerializationException):
+        processor.load_stream([b'{"obj"'], 'utf-8')
+
+
+def test_json_processor_iter_dump_resource(compound_resource):
+    processor = JSONSerializer()
+
+    assert ''.join(processor.iter_dump(compound_resource)) == json.dumps(compound_resource.data)
+    assert ''.join(processor.iter_dump(Resource())) == '{}'
+    assert ''.join(processor.iter_dump({'obj': [1, 2]})) == '{"obj": [1, 2]}'
+
+
+def test_json_processor_iter_dump_chunks(compound_resource):
+    processor = JSONSerializer()
+
+    chunks = list(processor.iter_dump(compound_resource, chunk_size=32))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 32 for chunk in chunks[:-1])
+    assert json.loads(''.join(chunks)) == compound_resource.data
+
+
+def test_serializer_iter_dump_resource(compound_resource):
+    processor = PassThroughSerializer()
+    assert list(processor.iter_dump(compound_resource)) == [str(compound_resource.data)]
+
+
+def test_json_processor_dump_bytes():
+    serializer = JSONSerializer()
+
+    assert serializer.dump_bytes({'name': 'Pão'}, 'utf-8') == b'{"name": "P\\u00e3o"}'
+
+
+def test_get_json_backend():
+    assert isinstance(get_json_backend('json'), JSONBackend)
+    assert get_json_backend('auto').available()
+
+    with pytest.raises(ValueError):
+        get_json_backend('invalid')
+
+
+def test_get_json_backend_fallback(monkeypatch):
+    monkeypatch.setattr('toy.serializers.ujson', None)
+
+    with pytest.warns(UserWarning):
+        backend = get_json_backend('ujson')
+
+    assert backend.name == 'json'
+
+
+@pytest.mark.parametrize('charset', ['utf-8', 'iso-8859-1'])
+def test_json_processor_orjson_backend(monkeypatch, charset):
+    pytest.importorskip('orjson')
+    monkeypatch.setattr(JSONSerializer, 'backend', get_json_backend('orjson'))
+    serializer = JSONSerializer()
+
+    content = serializer.dump_bytes({'name': 'Pão', 'tags': [1, 2]}, charset)
+
+    assert json.loads(content.decode(charset)) == {'name': 'Pão', 'tags': [1, 2]}
+    assert serializer.load(content, charset) == {'name': 'Pão', 'tags': [1, 2]}
+    with pytest.raises(SerializationException):
+        serializer.load('{invalid')
+
+
+def test_json_processor_orjson_backend_streaming(monkeypatch, envbuilder, compound_resource):
+    pytest.importorskip('orjson')
+    monkeypatch.setattr(JSONSerializer, 'backend', get_json_backend('orjson'))
+    compound_resource['name'] = 'Pão 5 €'
+    request = Request(envbuilder('GET', '/', accept='application/json'))
+
+    response = Processor(request).get_streaming_response(compound_resource)
+
+    assert response.charset == 'iso-8859-1'
+    assert json.loads(b''.join(response).decode('iso-8859-1')) == compound_resource.data
+    content = ''.join(NDJSONSerializer().iter_dump([{'price': '5 €'}]))
+    assert content.isascii()
+    assert json.loads(content) == {'price': '5 €'}
+
+
+def test_ndjson_processor_iter_load():
+    serializer = NDJSONSerializer()
+    chunks = [b'{"name": "first"}\n{"na', b'me": "s\xc3\xa9cond"}\n', b'\n{"name": "third"}']
+
+    records = serializer.iter_load(chunks, 'utf-8')
+
+    assert next(records) == {'name': 'first'}
+    assert list(records) == [{'name': 'sécond'}, {'name': 'third'}]
+    assert serializer.load('{"a": 1}\n{"a": 2}\n') == [{'a': 1}, {'a': 2}]
+
+
+def test_fail_ndjson_processor_load():
+    with pytest.raises(SerializationException):
+        NDJSONSerializer().load(b'{"name": "first"}\n{invalid}\n')
+
+
+def test_ndjson_processor_iter_dump(compound_resource):
+    serializer = NDJSONSerializer()
+
+    records = (compound_resource for _ in range(3))
+    content = ''.join(serializer.iter_dump(records, chunk_size=1))
+
+    assert content.splitlines() == [json.dumps(compound_resource.data)] * 3
+    assert serializer.dump({'a': 'line\nbreak'}) == '{"a": "line\\nbreak"}\n'
+
+
+@pytest.mark.parametrize(
+    ('module', 'serializer_class'),
+    [('msgpack', MessagePackSerializer), ('cbor2', CBORSerializer)],
+)
+def test_binary_processor(module, serializer_class, compound_resource):
+    pytest.importorskip(module)
+    serializer = serializers[serializer_class.content_type]
+
+    content = serializer.dump_bytes(compound_resource.data, 'utf-8')
+
+    assert isinstance(content, bytes)
+    assert serializer.load(content) == compound_resource.data
+    assert serializer.load_stream([content[:5], content[5:]], None) == compound_resource.data
+    with pytest.raises(SerializationException):
+        serializer.load(content[:-1])
+
+
+def test_processor_binary_response(envbuilder):
+    class BinaryJSONSerializer(BinarySerializer):
+        content_type = 'application/x-binary-json'
+
+        def _loads(self, content):
+            return json.loads(content)
+
+        def dump(self, obj):
+            return json.dumps(obj).encode('utf-8')
+
+    manager = SerializersManager()
+    manager.register(BinaryJSONSerializer)
+    request = Request(envbuilder('GET', '/', accept='application/x-binary-json'))
+
+    response = Processor(request, manager).get_response({'name': 'Name'})
+
+    assert response.headers['Content-Type'] == 'application/x-binary-json'
+    assert response.charset is None
+    assert response.body == b'{"name": "Name"}'
@@ -1,6 +1,23 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler
 
-from toy.server import HTTPServer
+import pytest
+
+from toy.server import HTTPServer, ReusePortMixin, ThreadPoolWSGIServer
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
 
 
 def test_basic_server(application):
@@ -20,3 +37,178 @@ def test_basic_server(application):
 def test_basic_server_string_port(application):
     server = HTTPServer(application, port='9000', quiet=True)
     assert server.port == 9000
+
+
+def test_server_mode_settings(application):
+    server = HTTPServer(application, mode='threaded', threads='4', workers='2', quiet=True)
+
+    assert server.mode == 'threaded'
+    assert server.threads == 4
+    assert server.workers == 2
+    assert server.max_requests == 0
+
+
+def test_fail_invalid_server_mode(application):
+    with pytest.raises(ValueError):
+        HTTPServer(application, mode='invalid')
+
+
+def test_threaded_server_mode_uses_thread_pool(application):
+    server = HTTPServer(application, mode='threaded', threads=2, port=0, quiet=True)
+    wsgi_server = server.make_server()
+
+    try:
+        assert isinstance(wsgi_server, ThreadPoolWSGIServer)
+        assert wsgi_server.threads == 2
+        assert wsgi_server.get_app() is application
+    finally:
+        wsgi_server.server_close()
+
+
+def test_prefork_server_binds_reusable_port(application):
+    server = HTTPServer(application, mode='prefork', threads=1, port=0, quiet=True)
+    wsgi_server = server.make_server(reuse_port=True)
+
+    try:
+        assert isinstance(wsgi_server, ReusePortMixin)
+        assert wsgi_server.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+    finally:
+        wsgi_server.server_close()
+
+
+def test_thread_pool_server_handles_requests_concurrently():
+    first_started = threading.Event()
+    second_done = threading.Event()
+
+    def app(environ, start_response):
+        if environ['PATH_INFO'] == '/first':
+            first_started.set()
+            second_done.wait(timeout=5)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [environ['PATH_INFO'].encode('ascii')]
+
+    wsgi_server = ThreadPoolWSGIServer(('localhost', 0), QuietRequestHandler, threads=2)
+    wsgi_server.set_app(app)
+    port = wsgi_server.server_address[1]
+    thread = threading.Thread(target=wsgi_server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        with ThreadPoolExecutor() as executor:
+            first = executor.submit(urlopen, f'http://localhost:{port}/first', timeout=5)
+            assert first_started.wait(timeout=5)
+
+            second = urlopen(f'http://localhost:{port}/second', timeout=5).read()
+            second_done.set()
+
+            assert second == b'/second'
+            assert first.result().read() == b'/first'
+    finally:
+        wsgi_server.shutdown()
+        wsgi_server.server_close()
+
+
+PREFORK_SCRIPT = """
+import os, sys, time
+from toy.server import HTTPServer
+
+worker = {}
+
+def post_fork():
+    while len(sys.argv) > 2 and os.path.exists(sys.argv[2]):  # workers hang while the file exists
+        time.sleep(0.05)
+    worker['pid'] = os.getpid()
+
+def app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [str(worker['pid']).encode('ascii')]
+
+server = HTTPServer(app, mode='prefork', port=int(sys.argv[1]), workers=2, threads=1, quiet=True)
+server.settings.update(post_fork=post_fork, ready_timeout=0.5)
+server.run()
+"""
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def _get_pid(port):
+    return int(urlopen(f'http://localhost:{port}/', timeout=5).read())
+
+
+def _start_prefork_server(port, *args):
+    process = subprocess.Popen(
+        [sys.executable, '-c', PREFORK_SCRIPT, str(port), *args],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            return process, _get_pid(port)
+        except OSError:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+
+def _child_pids(pid):
+    children = f'/proc/{pid}/task/{pid}/children'
+    if not os.path.exists(children):
+        pytest.skip('child processes are not listed in /proc')
+    with open(children) as f:
+        return {int(child) for child in f.read().split()}
+
+
+def test_prefork_server_rolling_restart():
+    port = _free_port()
+    process, pid = _start_prefork_server(port)
+    old_pids = {pid}
+
+    try:
+        process.send_signal(signal.SIGHUP)
+
+        # every request is answered while the workers are replaced
+        pids = set()
+        deadline = time.monotonic() + 10
+        while not pids or pids & old_pids:
+            assert time.monotonic() < deadline
+            pids = {_get_pid(port) for _ in range(20)}
+
+        assert process.poll() is None
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_prefork_server_rolling_restart_worker_not_ready(tmp_path):
+    port = _free_port()
+    hang = tmp_path / 'hang'
+    process, _ = _start_prefork_server(port, str(hang))
+
+    try:
+        old_pids = _child_pids(process.pid)
+        assert len(old_pids) == 2
+
+        hang.touch()
+        process.send_signal(signal.SIGHUP)
+        process.send_signal(signal.SIGHUP)
+        time.sleep(3)  # the replacements of both restarts time out
+
+        assert _child_pids(process.pid) == old_pids
+        assert {_get_pid(port) for _ in range(10)} <= old_pids
+
+        hang.unlink()
+        process.send_signal(signal.SIGHUP)
+
+        deadline = time.monotonic() + 10
+        while _child_pids(process.pid) & old_pids or len(_child_pids(process.pid)) != 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert process.poll() is None
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
@@ -131,3 +131,109 @@ def test_basic_validation_error():
     assert error.name == 'name'
     assert error.value == 'value'
     assert repr(error) == "<ValidationError message 'name' 'value'>"
+
+
+def test_field_value_validation():
+    validator = validators.Range(min_value=5)
+
+    assert validator.validate_value('int', 7) is None
+    assert validator.validate_value('int', 1).message == 'Invalid min value'
+
+
+def test_field_validation_with_legacy_validator():
+    class Even(validators.Validator):
+        def validate(self, field):
+            if field.value % 2:
+                return ValidationError('Odd value', field.name, field.value)
+
+    field = fields.IntegerField(name='int', validators=[Even()])
+    assert field.validate_value(2) == []
+    assert field.validate_value(3)[0].message == 'Odd value'
+
+
+def test_field_validation_with_legacy_builtin_validator_subclass():
+    class NotFive(validators.Type):
+        def validate(self, field):
+            error = super().validate(field)
+            if error is None and field.value == 5:
+                return ValidationError('Five is not allowed', field.name, field.value)
+            return error
+
+    field = fields.IntegerField(name='int', validators=[NotFive([int])])
+    assert field.validate_value(2) == []
+    assert field.validate_value(5)[0].message == 'Five is not allowed'
+    assert field.validate_value('X')[0].message == 'Invalid value type for this field'
+
+
+@pytest.mark.parametrize(
+    'value',
+    [None, 0, 1, 5, 7, 15, -1, 6.5, True, '', 'X', 'X' * 15, [], ['X'], object()],
+)
+def test_compiled_validation_matches_field_validation(value):
+    schema_fields = [
+        fields.CharField(name='char', max_length=10, validators=[validators.Length(min_length=5)]),
+        fields.IntegerField(name='int', min_value=5, max_value=10, required=True),
+        fields.IntegerField(name='unbounded'),
+        fields.BooleanField(name='bool', lazy=True),
+    ]
+    validate = validators.compile_validation(schema_fields)
+
+    errors = validate([value] * len(schema_fields))
+    expected = {field.name: field.validate_value(value) for field in schema_fields}
+
+    assert {name: [(e.message, e.name) for e in errs] for name, errs in errors.items()} == {
+        name: [(e.message, e.name) for e in errs] for name, errs in expected.items() if errs
+    }
+    assert 'bool' not in validate([value] * len(schema_fields), include_lazy=False)
+
+
+def test_compiled_validation_calls_custom_validators():
+    class Even(validators.Range):
+        def validate_value(self, name, value):
+            if value % 2:
+                return self._error('Odd value', validators.FieldValue(name, value))
+
+    validate = validators.compile_validation([fields.IntegerField(name='int', validators=[Even()])])
+
+    assert validate([2]) == {}
+    assert validate([3])['int'][0].message == 'Odd value'
+
+
+def test_compiled_validation_calls_custom_error_validators():
+    class Positive(validators.Range):
+        def _error(self, message, field):
+            return ValidationError(f'{field.name} must be positive', field.name, field.value)
+
+    validate = validators.compile_validation([fields.IntegerField(name='int', validators=[Positive(min_value=1)])])
+
+    assert validate([2]) == {}
+    assert validate([0])['int'][0].message == 'int must be positive'
+
+
+def test_compiled_validation_calls_legacy_validators():
+    class NotFive(validators.Type):
+        def validate(self, field):
+            if field.value == 5:
+                return ValidationError('Five is not allowed', field.name, field.value)
+            return super().validate(field)
+
+    validate = validators.compile_validation([fields.IntegerField(name='int', validators=[NotFive([int])])])
+
+    assert validate([2]) == {}
+    assert validate([5])['int'][0].message == 'Five is not allowed'
+    assert validate(['X'])['int'][0].message == 'Invalid value type for this field'
+
+
+def test_legacy_validators_build_errors_with_error_helper():
+    class Even(validators.Validator):
+        def validate(self, field):
+            if field.value % 2:
+                return self._error('Odd value', field)
+
+    int_field = fields.IntegerField(name='int', validators=[Even()])
+    validate = validators.compile_validation([int_field])
+
+    assert validate([2]) == {}
+    assert validate([3])['int'][0].message == 'Odd value'
+    assert Even().validate_value('int', 3).name == 'int'
+    assert int_field.validate_value(3)[0].value == 3
@@ -1,8 +1,10 @@
-from staty import HTTPError, MethodNotAllowed, MethodNotAllowedException, NotFoundException
+from staty import HTTPError, MethodNotAllowed, MethodNotAllowedException, NotFoundException, PayloadTooLargeException
 
 from toy.exceptions import UnauthorizedException, UnsupportedMediaTypeException
 
-from .http import Request, Response, WSGIResponse
+from . import concurrency
+from .compression import Compressor
+from .http import ASGIResponse, Request, Response, WSGIResponse, asgi_to_environ, read_asgi_body
 from .routing import Routes
 
 
@@ -29,6 +31,23 @@ class Application:
     def debug(self, value):
         self.config['debug'] = value
 
+    @property
+    def max_body_size(self):
+        return self.config.get('max_body_size')
+
+    @property
+    def compressor(self) -> Compressor | None:
+        compressor = self.config.get('compression')
+        if compressor is True:
+            compressor = self.config['compression'] = Compressor()
+        return compressor or None
+
+    def process_response(self, request: Request, response: Response) -> Response:
+        compressor = self.compressor
+        if compressor is not None:
+            response = compressor.compress(request, response)
+        return response
+
     def add_extension(self, key, value):
         if key in self.extensions:
             raise KeyError(f'Key {key} already exists')
@@ -41,48 +60,98 @@ class Application:
     def add_route(self, path, handler):
         self.routes.add_route(path, handler)
 
+    def _handle_error(self, request: Request, exc: Exception) -> Response:
+        if isinstance(exc, NotFoundException):
+            return self.routes.not_found(request)
+
+        if isinstance(exc, UnauthorizedException):
+            return self.routes.unauthorized(request, exc)
+
+        if isinstance(exc, UnsupportedMediaTypeException):
+            return self.routes.unsupported_media_type(request, exc)
+
+        if isinstance(exc, HTTPError):
+            return Response(str(exc), status=exc.status)
+
+        # We need to intercept all exceptions to return appropriate 500 response
+        if self.debug:
+            raise exc
+        return self.routes.internal_error(request)
+
     def call_handler(self, request: Request) -> Response:
-        path = request.path
-        routes = self.routes.match(path)
+        matches = self.routes.match(request.path)
 
-        if not routes:
+        if not matches:
             return self.routes.not_found(request)
 
-        for route in routes:
-            request.path_arguments.update(route.path_arguments)
+        for match in matches:
+            request.path_arguments.update(match.path_arguments)
 
             # noinspection PyBroadException
             try:
-                response = route.handler(request)
+                return concurrency.run_sync(match.handler, request)
             except MethodNotAllowedException:
                 continue
+            except Exception as exc:
+                return self._handle_error(request, exc)
 
-            except NotFoundException:
-                return self.routes.not_found(request)
+        return Response(f'Method {request.method} not allowed', status=MethodNotAllowed())
 
-            except UnauthorizedException as ex:
-                return self.routes.unauthorized(request, ex)
+    async def call_handler_async(self, request: Request) -> Response:
+        matches = self.routes.match(request.path)
 
-            except UnsupportedMediaTypeException as ex:
-                return self.routes.unsupported_media_type(request, ex)
+        if not matches:
+            return self.routes.not_found(request)
 
-            except HTTPError as ex:
-                response = Response(str(ex), status=ex.status)
+        for match in matches:
+            request.path_arguments.update(match.path_arguments)
 
-            # We need to intercept all exceptions to return appropriate 500 response
-            except Exception:
-                if self.debug:
-                    raise
-                return self.routes.internal_error(request)
+            dispatch_async = getattr(match.handler, 'dispatch_async', None)
 
-            return response
+            # noinspection PyBroadException
+            try:
+                if dispatch_async is not None:
+                    return await dispatch_async(request)
+                return await concurrency.run_async(match.handler, request)
+            except MethodNotAllowedException:
+                continue
+            except Exception as exc:
+                return self._handle_error(request, exc)
 
         return Response(f'Method {request.method} not allowed', status=MethodNotAllowed())
 
     def __call__(self, environ, start_response):
-        request = Request(environ)
-        response = self.call_handler(request)
-        wsgi_response = WSGIResponse(response)
+        request = Request(environ, max_body_size=self.max_body_size)
+        response = self.process_response(request, self.call_handler(request))
+        wsgi_response = WSGIResponse(response, environ)
 
         start_response(wsgi_response.status, wsgi_response.headers)
         return wsgi_response.body
+
+    async def asgi(self, scope, receive, send):
+        """ASGI entry point. Serve it with an ASGI server using ``application.asgi``."""
+        if scope['type'] == 'lifespan':
+            return await self._asgi_lifespan(receive, send)
+
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported ASGI scope type {scope["type"]!r}')
+
+        try:
+            body = await read_asgi_body(receive, self.max_body_size)
+        except PayloadTooLargeException as exc:
+            response = Response(str(exc), status=exc.status)
+        else:
+            request = Request(asgi_to_environ(scope, body), max_body_size=self.max_body_size)
+            response = self.process_response(request, await self.call_handler_async(request))
+
+        await ASGIResponse(response).send(send)
+
+    # noinspection PyMethodMayBeStatic
+    async def _asgi_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
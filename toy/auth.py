@@ -0,0 +1,142 @@
+"""Authentication backends for :meth:`toy.handlers.Handler.authorize`.
+
+Handlers try their ``authentication_backends`` in order and set
+``request.user`` to the first user found::
+
+    tokens = TokenBackend(secret, load_user=CachedUserLoader(load_user), max_age=3600)
+
+    class Recipe(ResourceHandler):
+        authentication_backends = [tokens]
+        authentication_required = ['post', 'put', 'patch', 'delete']
+
+Clients get their tokens from an endpoint that calls :meth:`TokenBackend.issue`
+after checking their password once.
+"""
+
+import base64
+import binascii
+import hmac
+import time
+
+from .cache import MemoryCache
+from .exceptions import UnauthorizedException
+from .http import Request
+
+
+class AuthenticationBackend:
+    scheme = ''  # Authorization header scheme, e.g. Bearer
+    realm = ''
+
+    def get_credentials(self, request: Request) -> str | None:
+        """Return the credentials of the ``Authorization`` header when it uses :attr:`scheme`."""
+        authorization = request.get_header('Authorization')
+        if not authorization:
+            return None
+
+        scheme, _, credentials = authorization.partition(' ')
+        if scheme.lower() != self.scheme.lower() or not credentials.strip():
+            return None
+        return credentials.strip()
+
+    def unauthorized(self) -> UnauthorizedException:
+        return UnauthorizedException(self.scheme, self.realm)
+
+    def authenticate(self, request: Request):
+        """Return the user of ``request`` or ``None`` when it has no credentials
+        for this backend. Invalid credentials raise :class:`UnauthorizedException`."""
+        raise NotImplementedError('Abstract class')  # pragma: nocover
+
+
+class CachedUserLoader:
+    """Keep the users returned by ``load(user_id)`` in a bounded cache with
+    ``ttl`` seconds of time to live. Unknown users are not cached."""
+
+    def __init__(self, load, max_entries=1024, ttl=60):
+        self.load = load
+        self._cache = MemoryCache(max_entries=max_entries, ttl=ttl)
+
+    def __call__(self, user_id):
+        user = self._cache.get((user_id,))
+        if user is None:
+            user = self.load(user_id)
+            if user is not None:
+                self._cache.set((user_id,), user)
+        return user
+
+    def invalidate(self, user_id):
+        self._cache.invalidate(user_id)
+
+
+def _encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class TokenBackend(AuthenticationBackend):
+    """Stateless bearer tokens signed with HMAC.
+
+    A token carries the user id and its expiration time, so verifying it only
+    takes a signature check. ``load_user(user_id)`` returns the user of a
+    valid token (or ``None``) and is usually a :class:`CachedUserLoader`.
+    """
+
+    scheme = 'Bearer'
+
+    def __init__(self, secret, load_user, max_age=3600, realm='', digest='sha256'):
+        if isinstance(secret, str):
+            secret = secret.encode('utf-8')
+        if not secret:
+            raise ValueError('A secret is required to sign tokens')
+
+        self.secret = secret
+        self.load_user = load_user
+        self.max_age = max_age
+        self.realm = realm
+        self.digest = digest
+
+    def _sign(self, payload: str) -> str:
+        return _encode(hmac.new(self.secret, payload.encode('ascii'), self.digest).digest())
+
+    def issue(self, user_id, now=None) -> str:
+        if now is None:
+            now = time.time()
+
+        payload = f'{_encode(str(user_id).encode("utf-8"))}.{int(now) + self.max_age}'
+        return f'{payload}.{self._sign(payload)}'
+
+    def verify(self, token: str, now=None) -> str | None:
+        """Return the user id of a valid and unexpired ``token`` or ``None``."""
+        payload, _, signature = token.rpartition('.')
+        try:
+            if not hmac.compare_digest(signature, self._sign(payload)):
+                return None
+        except (TypeError, UnicodeEncodeError):
+            return None
+
+        encoded_user_id, _, expires = payload.partition('.')
+        if now is None:
+            now = time.time()
+
+        try:
+            if int(expires) < now:
+                return None
+            return _decode(encoded_user_id).decode('utf-8')
+        except (ValueError, binascii.Error):
+            return None
+
+    def authenticate(self, request: Request):
+        token = self.get_credentials(request)
+        if token is None:
+            return None
+
+        user_id = self.verify(token)
+        if user_id is None:
+            raise self.unauthorized()
+
+        user = self.load_user(user_id)
+        if user is None:
+            raise self.unauthorized()
+        return user
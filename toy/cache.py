@@ -0,0 +1,189 @@
+"""Response caches for :class:`toy.handlers.ResourceHandler`.
+
+A cache is enabled per handler with the ``response_cache`` attribute::
+
+    class Recipe(ResourceHandler):
+        resource_type = RecipeResource
+        response_cache = MemoryCache(max_entries=1024, ttl=60)
+
+:class:`MemoryCache` lives in the worker process. Multi-worker servers share
+one cache through :func:`start_cache_server` and :class:`SocketCache`::
+
+    manager = start_cache_server('/tmp/recipes-cache.sock', authkey=b'secret')
+    cache = SocketCache('/tmp/recipes-cache.sock', authkey=b'secret')
+
+Cache keys are tuples whose first item is the request path, so every entry of
+a path can be invalidated at once.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager, RemoteError
+from typing import NamedTuple
+
+
+class CachedResponse(NamedTuple):
+    headers: tuple
+    body: bytes
+
+
+class MemoryCache:
+    """Thread safe in-process cache with size-bounded LRU eviction.
+
+    :param max_entries: number of entries kept before the least recently used is evicted.
+    :param ttl: default time to live in seconds. ``None`` keeps entries until evicted.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires, value)
+        self._paths = {}  # path -> keys
+        self._generation = 0  # incremented by every invalidation
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        del self._entries[key]
+        keys = self._paths[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._paths[key[0]]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key, value, ttl=None, generation=None):
+        """Store ``value``. When ``generation`` is given (the :meth:`generation`
+        read before computing the value) and an invalidation happened since,
+        the value may be stale and is not stored."""
+        if ttl is None:
+            ttl = self.ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            self._paths.setdefault(key[0], set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *paths):
+        """Remove the entries of every path in ``paths``."""
+        with self._lock:
+            self._generation += 1
+            for path in paths:
+                for key in list(self._paths.get(path, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._paths.clear()
+
+
+_server_cache = None
+
+
+def _init_server_cache(max_entries, ttl):
+    global _server_cache
+    _server_cache = MemoryCache(max_entries=max_entries, ttl=ttl)
+
+
+def _get_server_cache():
+    return _server_cache
+
+
+class _CacheManager(BaseManager):
+    pass
+
+
+_CacheManager.register(
+    'get_cache',
+    callable=_get_server_cache,
+    exposed=('get', 'generation', 'set', 'invalidate', 'clear'),
+)
+
+
+def start_cache_server(address=None, authkey=None, max_entries=1024, ttl=60):
+    """Start a process serving one :class:`MemoryCache` on ``address`` (a unix
+    socket path or a ``(host, port)`` tuple) and return its manager.
+
+    Call ``shutdown()`` on the manager to stop it.
+    """
+    manager = _CacheManager(address=address, authkey=authkey)
+    manager.start(_init_server_cache, (max_entries, ttl))
+    return manager
+
+
+class SocketCache:
+    """Client of a cache started with :func:`start_cache_server`.
+
+    Each process (and thread) opens its own connection, so the client can be
+    created before the server forks its workers. A cache server that cannot
+    be reached, rejects the authkey or fails behaves like an empty cache.
+    """
+
+    def __init__(self, address, authkey=None):
+        self.address = address
+        self.authkey = authkey
+        self._proxy = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_proxy(self):
+        with self._lock:
+            if self._proxy is None or self._pid != os.getpid():
+                manager = _CacheManager(address=self.address, authkey=self.authkey)
+                manager.connect()
+                self._proxy = manager.get_cache()
+                self._pid = os.getpid()
+            return self._proxy
+
+    def _call(self, method, *args):
+        try:
+            return getattr(self._get_proxy(), method)(*args)
+        except (OSError, EOFError, AuthenticationError, RemoteError):
+            self._proxy = None
+            return None
+
+    def get(self, key):
+        return self._call('get', key)
+
+    def generation(self):
+        """Return the generation of the server cache or ``None`` when it can't
+        be reached. Handlers don't store responses without a generation."""
+        return self._call('generation')
+
+    def set(self, key, value, ttl=None, generation=None):
+        self._call('set', key, value, ttl, generation)
+
+    def invalidate(self, *paths):
+        self._call('invalidate', *paths)
+
+    def clear(self):
+        self._call('clear')
@@ -0,0 +1,252 @@
+"""Response compression negotiated through the ``Accept-Encoding`` header.
+
+Compression is opt-in: pass a :class:`Compressor` (or ``True`` for the
+defaults) as the ``compression`` setting of the application::
+
+    app = Application(compression=Compressor(min_size=1024, level=6))
+
+Brotli (``br``) is only offered when the ``brotli`` package is installed.
+"""
+
+import copy
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+from .http import Request, Response, StreamingResponse, parse_content_type
+
+try:
+    import brotli
+except ImportError:  # pragma: nocover
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = frozenset(
+    {
+        'application/javascript',
+        'application/json',
+        'application/x-ndjson',
+        'application/xml',
+        'image/svg+xml',
+    },
+)
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk) -> bytes:
+        # flush every chunk so clients get data as soon as it is produced
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        return _GzipStream(self.level)
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def compress(self, data) -> bytes:
+        return brotli.compress(bytes(data), quality=self.quality)
+
+    def stream(self):
+        return _BrotliStream(self.quality)
+
+
+@lru_cache(maxsize=128)
+def select_encoding(accept_encoding: str, available: tuple) -> str | None:
+    """Return the encoding of ``available`` (in order of preference) with the
+    highest quality in the ``Accept-Encoding`` header or ``None``."""
+    qualities = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        qualities[name.strip()] = quality
+
+    selected = None
+    selected_quality = 0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get('*', 0))
+        if quality > selected_quality:
+            selected, selected_quality = encoding, quality
+    return selected
+
+
+class _CompressedStream:
+    # compresses the chunks of a response while the server iterates them,
+    # synchronously (WSGI) or asynchronously (ASGI)
+    def __init__(self, response: StreamingResponse, encoder):
+        self._response = response
+        self._encoder = encoder
+
+    def __iter__(self):
+        stream = self._encoder.stream()
+        for chunk in self._response:
+            if compressed := stream.compress(chunk):
+                yield compressed
+        yield stream.finish()
+
+    async def __aiter__(self):
+        stream = self._encoder.stream()
+        async for chunk in self._response:
+            if compressed := stream.compress(chunk):
+                yield compressed
+        yield stream.finish()
+
+    def close(self):
+        self._response.close()
+
+
+class Compressor:
+    """Compress response bodies with the best encoding accepted by the client.
+
+    :param min_size: bodies smaller than this (in bytes) are sent as is.
+    :param level: gzip compression level (1-9).
+    :param brotli_quality: brotli quality (0-11).
+    :param cache_size: number of compressed bodies kept to serve repeated
+        (static or cacheable) payloads without compressing them again.
+    :param content_types: media types worth compressing. ``text/*`` is always included.
+    """
+
+    def __init__(
+        self,
+        min_size=1024,
+        level=6,
+        brotli_quality=5,
+        cache_size=0,
+        content_types=COMPRESSIBLE_CONTENT_TYPES,
+    ):
+        self.min_size = min_size
+        self.content_types = frozenset(content_types)
+
+        encoders = []
+        if brotli is not None:
+            encoders.append(BrotliEncoder(brotli_quality))
+        encoders.append(GzipEncoder(level))
+        self.encoders = {encoder.name: encoder for encoder in encoders}
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def is_compressible(self, response: Response) -> bool:
+        content_type = response.headers.get('Content-Type')
+        if not content_type or 'Content-Encoding' in response.headers:
+            return False
+
+        if response.status.code < 200 or response.status.code in (204, 206, 304):
+            return False
+
+        media_type, _ = parse_content_type(content_type)
+        return media_type.startswith('text/') or media_type in self.content_types
+
+    def _compress(self, encoder, body) -> bytes:
+        if not self.cache_size:
+            return encoder.compress(body)
+
+        key = (encoder.name, hashlib.blake2b(body, digest_size=16).digest())
+        with self._cache_lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+                return compressed
+
+        compressed = encoder.compress(body)
+
+        with self._cache_lock:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return compressed
+
+    @staticmethod
+    def _add_vary(response):
+        vary = response.headers.get('Vary')
+        if not vary:
+            response.headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower():
+            response.headers['Vary'] = f'{vary}, Accept-Encoding'
+
+    @staticmethod
+    def _weaken_etag(response):
+        # the compressed body is a different sequence of bytes
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = f'W/{etag}'
+
+    def _not_modified(self, request, response):
+        # a 304 has no body to check whether the 200 was compressed, but the
+        # client validates a compressed representation with its weakened ETag
+        etag = response.headers.get('ETag')
+        if not etag:
+            return response
+
+        self._add_vary(response)
+        tags = {tag.strip() for tag in request.get_header('If-None-Match', '').split(',')}
+        if f'W/{etag}' in tags and etag not in tags:
+            self._weaken_etag(response)
+        return response
+
+    def compress(self, request: Request, response: Response) -> Response:
+        if response.status.code == 304:
+            return self._not_modified(request, response)
+
+        if not self.is_compressible(response):
+            return response
+
+        self._add_vary(response)
+
+        streaming = isinstance(response, StreamingResponse)
+        if not streaming and response.content_length < self.min_size:
+            return response
+
+        encoding = select_encoding(request.get_header('Accept-Encoding', ''), tuple(self.encoders))
+        if encoding is None:
+            return response
+
+        encoder = self.encoders[encoding]
+        if streaming:
+            response.data = _CompressedStream(copy.copy(response), encoder)
+        else:
+            response.data = self._compress(encoder, response.body)
+
+        response.headers['Content-Encoding'] = encoding
+        self._weaken_etag(response)
+        return response
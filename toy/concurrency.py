@@ -0,0 +1,205 @@
+"""Helpers to run sync and async handlers under both WSGI and ASGI servers.
+
+Under an event loop (ASGI) coroutine functions are awaited natively and
+plain functions run in the loop's default executor, so blocking code never
+stalls the loop. Under synchronous servers (WSGI) plain functions are called
+directly and coroutines run on a background event loop shared by all the
+worker threads of the process, so concurrent requests overlap their waits.
+
+Coroutine functions decorated with :func:`portable` only await through
+:func:`call`. Synchronous servers run them in the worker thread without
+involving the event loop at all.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import inspect
+import threading
+
+_inline = contextvars.ContextVar('toy_concurrency_inline', default=False)
+
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def is_async_callable(func) -> bool:
+    while isinstance(func, functools.partial):
+        func = func.func
+
+    if inspect.iscoroutinefunction(func):
+        return True
+
+    if inspect.isroutine(func) or inspect.isclass(func):
+        return False
+
+    return inspect.iscoroutinefunction(getattr(func, '__call__', None))
+
+
+def portable(func):
+    """Mark a coroutine function that only awaits :func:`call` (or :func:`wait`)."""
+    func.portable = True
+    return func
+
+
+def is_portable(func) -> bool:
+    return getattr(func, 'portable', False)
+
+
+def _get_background_loop():
+    global _background_loop
+
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='toy-event-loop', daemon=True)
+            thread.start()
+            _background_loop = loop
+
+    return _background_loop
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _run_in_background(awaitable):
+    future = asyncio.run_coroutine_threadsafe(_await(awaitable), _get_background_loop())
+    return future.result()
+
+
+def _drive(coroutine):
+    token = _inline.set(True)
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        _inline.reset(token)
+
+    coroutine.close()
+    raise RuntimeError('Portable coroutines must only await toy.concurrency.call() or toy.concurrency.wait()')
+
+
+def run_sync(func, *args, **kwargs):
+    """Call ``func`` from synchronous code and return its result."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError('run_sync() cannot be called from a running event loop')
+
+    result = func(*args, **kwargs)
+    if not inspect.isawaitable(result):
+        return result
+
+    if is_portable(func) and inspect.iscoroutine(result):
+        return _drive(result)
+
+    return _run_in_background(result)
+
+
+async def run_async(func, *args, **kwargs):
+    """Call ``func`` from a coroutine without blocking the running event loop."""
+    if is_async_callable(func):
+        return await func(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    result = await loop.run_in_executor(None, functools.partial(context.run, func, *args, **kwargs))
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def wait(awaitable):
+    """Wait for ``awaitable`` from a :func:`portable` coroutine."""
+    if _inline.get():
+        return _run_in_background(awaitable)
+    return await awaitable
+
+
+async def call(func, *args, **kwargs):
+    """Call ``func`` from a :func:`portable` coroutine."""
+    if _inline.get():
+        return run_sync(func, *args, **kwargs)
+    return await run_async(func, *args, **kwargs)
+
+
+def then(result, callback):
+    """Return ``callback(result)``, waiting for ``result`` first if it is awaitable."""
+    if inspect.isawaitable(result):
+        return _then(result, callback)
+    return callback(result)
+
+
+async def _then(awaitable, callback):
+    return callback(await awaitable)
+
+
+def then_all(results, callback):
+    """Like :func:`then` for a list of results, waiting for them in order."""
+    if any(inspect.isawaitable(result) for result in results):
+        return _then_all(results, callback)
+    return callback(results)
+
+
+async def _then_all(results, callback):
+    values = []
+    for result in results:
+        if inspect.isawaitable(result):
+            result = await result
+        values.append(result)
+    return callback(values)
+
+
+class SingleFlight:
+    """Share one call among concurrent callers that use the same key.
+
+    The first caller of :meth:`do` for a key (the leader) calls the function
+    and the callers arriving while it runs wait for its result instead of
+    calling it again. Works from worker threads and from event loops, and
+    ``leaders`` and ``coalesced`` count both kinds of callers.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @portable
+    async def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = concurrent.futures.Future()
+                self.leaders += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if _inline.get():
+                return future.result()
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await call(func, *args, **kwargs)
+        except BaseException as exc:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
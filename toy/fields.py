@@ -6,6 +6,19 @@ from .validators import Length, Range, Required, Type, TypeList, Validator
 
 
 class Field:
+    __slots__ = (
+        'name',
+        'lazy',
+        'validators',
+        'required',
+        '_old_value',
+        '_value',
+        'request',
+        'application_args',
+        '_args',
+        '_kwargs',
+    )
+
     default_validators = []
 
     def __init__(self, name, lazy=False, required=False, validators=None, *args, **kwargs):
@@ -17,7 +30,7 @@ class Field:
         self._load_validators(validators)
 
         self._old_value = None
-        self._value = None
+        self._value = self.empty_value()
 
         self.request = None
         self.application_args = None
@@ -50,13 +63,41 @@ class Field:
         field.validators = self.validators[:]
         return field
 
+    # Value level API used by compiled resource schemas, where a single Field
+    # instance describes the values of every resource of the same type.
+    def empty_value(self):
+        return None
+
+    def convert(self, value, request=None, application_args=None):
+        return value
+
+    def to_data(self, value):
+        return value
+
+    def to_shallow_data(self, value):
+        """Like :meth:`to_data`, but nested resources are kept as :class:`Resource` objects."""
+        return self.to_data(value)
+
+    def validate_value(self, value):
+        errors = []
+        for validator in self.validators:
+            error = validator.check(self.name, value)
+            if not error:
+                continue
+            errors.append(error)
+        return errors
+
     def _get_data(self):
-        return self.value
+        return self.to_data(self.value)
 
     @property
     def data(self):
         return self._get_data()
 
+    @property
+    def shallow_data(self):
+        return self.to_shallow_data(self.value)
+
     @property
     def dirty(self):
         return self.value != self.old_value
@@ -66,6 +107,8 @@ class Field:
         return self._old_value
 
     def _set_value(self, new_value):
+        new_value = self.convert(new_value, self.request, self.application_args)
+
         if new_value == self._value:
             return
 
@@ -88,12 +131,7 @@ class Field:
         if not include_lazy and self.lazy:
             return
 
-        errors = []
-        for validator in self.validators:
-            error = validator.validate(self)
-            if not error:
-                continue
-            errors.append(error)
+        errors = self.validate_value(self.value)
 
         if raise_exception and errors:
             raise ValidationException('Validation Error', errors=errors)
@@ -110,15 +148,19 @@ class Field:
 
 
 class UUIDField(Field):
+    __slots__ = ()
+
     default_validators = [Type([UUID])]
 
-    def _get_data(self):
-        if self.value is None:
+    def to_data(self, value):
+        if value is None:
             return
-        return str(self.value)
+        return str(value)
 
 
 class CharField(Field):
+    __slots__ = ()
+
     default_validators = [Type([str])]
 
     def __init__(self, name, max_length, *args, **kwargs):
@@ -127,6 +169,8 @@ class CharField(Field):
 
 
 class IntegerField(Field):
+    __slots__ = ()
+
     default_validators = [Type([int])]
 
     def __init__(self, name, min_value: int | None = None, max_value: int | None = None, *args, **kwargs):
@@ -135,10 +179,14 @@ class IntegerField(Field):
 
 
 class BooleanField(Field):
+    __slots__ = ()
+
     default_validators = [Type([bool])]
 
 
 class ResourceField(Field):
+    __slots__ = ('resource_type',)
+
     def __init__(self, name, resource_type, *args, **kwargs):
         super().__init__(name, resource_type=resource_type, *args, **kwargs)
 
@@ -149,24 +197,26 @@ class ResourceField(Field):
 
         self.resource_type = resource_type
 
-    def _set_value(self, new_value):
-        if isinstance(new_value, Resource):
-            return super()._set_value(new_value)  # to be .validate()'d
+    def convert(self, value, request=None, application_args=None):
+        if isinstance(value, Resource):
+            return value  # to be .validate()'d
 
-        resource = self.resource_type(
-            request=self.request,
-            application_args=self.application_args,
-        )
-        resource.update(new_value)
-        super()._set_value(resource)
+        resource = self.resource_type(request=request, application_args=application_args)
+        resource.update(value)
+        return resource
 
-    def _get_data(self):
-        if self.value is None:
+    def to_data(self, value):
+        if value is None:
             return
-        return self.value.data
+        return value.data
+
+    def to_shallow_data(self, value):
+        return value
 
 
 class ResourceListField(Field):
+    __slots__ = ('resource_type',)
+
     def __init__(self, name, resource_type, *args, **kwargs):
         super().__init__(name, resource_type=resource_type, *args, **kwargs)
 
@@ -176,26 +226,28 @@ class ResourceListField(Field):
         self.validators.append(TypeList([resource_type]))
 
         self.resource_type = resource_type
-        self._value = []
 
-    def _set_value(self, new_value):
-        if not isinstance(new_value, list | tuple):
-            return super()._set_value(new_value)  # to be .validate()'d
+    def empty_value(self):
+        return []
+
+    def convert(self, value, request=None, application_args=None):
+        if not isinstance(value, list | tuple):
+            return value  # to be .validate()'d
 
         resources = []
-        for item in new_value:
+        for item in value:
             if isinstance(item, Resource):
                 resources.append(item)
                 continue
 
-            resource = self.resource_type(
-                request=self.request,
-                application_args=self.application_args,
-            )
+            resource = self.resource_type(request=request, application_args=application_args)
             resource.update(item)
             resources.append(resource)
 
-        super()._set_value(resources)
+        return resources
 
-    def _get_data(self):
-        return [resource.data for resource in self.value]
+    def to_data(self, value):
+        return [resource.data for resource in value]
+
+    def to_shallow_data(self, value):
+        return value
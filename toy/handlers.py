@@ -1,16 +1,20 @@
 import re
+from datetime import datetime
 
 from staty import codes as status
 from staty import exceptions as error_status
 
-from . import fields
-from .exceptions import ResourceNotFoundException, SerializationException, ValidationException
-from .http import HTTP_METHODS, Request, Response
+from . import concurrency, fields
+from .cache import CachedResponse
+from .exceptions import ResourceNotFoundException, SerializationException, UnauthorizedException, ValidationException
+from .http import HTTP_METHODS, Request, Response, http_date, make_etag
 from .resources import Processor, Resource
 
 
 class Handler:
     allowed_methods = []
+    authentication_backends = []  # toy.auth backends tried in order
+    authentication_required = []  # methods rejected without an authenticated user
 
     def __init__(self, methods=None, **kwargs):
         self.application_args = kwargs
@@ -36,12 +40,34 @@ class Handler:
         return handler
 
     def authorize(self, request):
-        pass
+        if request.method.lower() not in (m.lower() for m in self.authentication_required):
+            return
+
+        for backend in self.authentication_backends:
+            user = backend.authenticate(request)
+            if user is not None:
+                request.user = user
+                return
+
+        raise self.unauthorized()
+
+    def unauthorized(self) -> UnauthorizedException:
+        """Return the exception raised for requests without credentials."""
+        if self.authentication_backends:
+            return self.authentication_backends[0].unauthorized()
+        return UnauthorizedException('Bearer')
 
     def dispatch(self, request: Request) -> Response:
         handler = self._find_handler(request)
-        self.authorize(request)
-        return handler(request)
+        concurrency.run_sync(self.authorize, request)
+        return concurrency.run_sync(handler, request)
+
+    async def dispatch_async(self, request: Request) -> Response:
+        handler = self._find_handler(request)
+        authorize = getattr(self.authorize, '__func__', None) is not Handler.authorize
+        if authorize or self.authentication_required:
+            await concurrency.run_async(self.authorize, request)
+        return await concurrency.run_async(handler, request)
 
     def __call__(self, request: Request) -> Response:
         return self.dispatch(request)
@@ -68,6 +94,49 @@ class ResourceHandler(Handler):
     resource_type = None
     error_response_resource_class = ErrorResponseResource
     route_template = ''
+    streaming = False  # serialize GET responses while they are sent
+    bulk = False  # accept a list of resources in POST requests
+    response_cache = None  # cache of GET responses, see toy.cache
+    response_cache_ttl = None  # seconds, defaults to the cache ttl
+    single_flight = None  # concurrency.SingleFlight sharing the work of identical concurrent GETs
+
+    def dispatch(self, request: Request) -> Response:
+        response = super().dispatch(request)
+        self._invalidate_cache(request, response)
+        return response
+
+    async def dispatch_async(self, request: Request) -> Response:
+        response = await super().dispatch_async(request)
+        self._invalidate_cache(request, response)
+        return response
+
+    def _invalidate_cache(self, request, response):
+        if self.response_cache is None or request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return
+        if response.status.code >= 400:
+            return
+
+        # changes on /recipes/<id>/rating are visible on /recipes/<id> and /recipes
+        paths = {request.path}
+        path = request.path.rstrip('/')
+        while path:
+            paths.add(path)
+            path = path.rpartition('/')[0]
+        self.response_cache.invalidate(*paths)
+
+    def _cache_key(self, request, processor):
+        content_type, _, charset = processor.negotiate()
+        return request.path, request.environ.get('QUERY_STRING', ''), content_type, charset
+
+    def _cached_response(self, request, processor, cached, response_status=None):
+        if response_status is None:
+            response_status = status.Ok()
+
+        headers = dict(cached.headers)
+        etag = headers.get('ETag')
+        if response_status == status.Ok() and etag is not None and request.is_fresh(etag):
+            return processor.get_not_modified_response({'ETag': etag})
+        return Response(cached.body, status=response_status, headers=headers, content_type=headers.get('Content-Type'))
 
     def get_route(self, resource: Resource):
         route_args = set(re.findall(r'<(.*?)>', self.route_template))
@@ -85,6 +154,12 @@ class ResourceHandler(Handler):
 
         return route
 
+    async def _call_resource(self, hook, operation, *args, **kwargs):
+        # coroutine hooks are awaited natively, blocking ones run off the event loop
+        if concurrency.is_async_callable(hook):
+            return await concurrency.wait(operation(*args, **kwargs))
+        return await concurrency.call(operation, *args, **kwargs)
+
     def _bad_request_error(self, exc, processor, request):
         resource = self.error_response_resource_class(
             request=request,
@@ -96,7 +171,8 @@ class ResourceHandler(Handler):
             status=status.BadRequest(),
         )
 
-    def post(self, request):
+    @concurrency.portable
+    async def post(self, request):
         resource = self.resource_type(
             request=request,
             application_args=self.application_args,
@@ -112,10 +188,13 @@ class ResourceHandler(Handler):
                 status=status.BadRequest(),
             )
 
+        if isinstance(data, list):
+            return await self._bulk_post(request, processor, data)
+
         resource.update(data)
 
         try:
-            response_resource = resource.create()
+            response_resource = await self._call_resource(resource.do_create, resource.create)
         except ValidationException as exc:
             return self._bad_request_error(exc, processor, request)
 
@@ -129,32 +208,124 @@ class ResourceHandler(Handler):
             headers=headers,
         )
 
-    def get(self, request):
+    async def _bulk_post(self, request, processor, items):
+        if not self.bulk:
+            return processor.get_response(
+                {'errors': ['Bulk requests are not supported by this resource']},
+                status=status.BadRequest(),
+            )
+
+        try:
+            resources, _ = self.resource_type.validate_many(
+                items,
+                request=request,
+                application_args=self.application_args,
+                include_lazy=False,
+                raise_exception=True,
+            )
+            created = await self._call_resource(
+                self.resource_type.do_bulk_create,
+                self.resource_type.bulk_create,
+                resources,
+                request=request,
+                application_args=self.application_args,
+            )
+        except ValidationException as exc:
+            return self._bad_request_error(exc, processor, request)
+
+        return processor.get_response(
+            data=[resource.data for resource in created],
+            status=status.Created(),
+        )
+
+    def _validator_headers(self, processor, version):
+        if version is None:
+            return {}
+
+        content_type, _, charset = processor.negotiate()
+        headers = {'ETag': make_etag(version, content_type, charset)}
+        if isinstance(version, datetime):
+            headers['Last-Modified'] = http_date(version)
+        return headers
+
+    @concurrency.portable
+    async def get(self, request):
         processor = Processor(request)
 
+        cache_key = generation = None
+        if self.response_cache is not None:
+            cache_key = self._cache_key(request, processor)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return self._cached_response(request, processor, cached)
+            # responses loaded while the resource changes are not stored, and
+            # neither are they when the generation can't be read (None)
+            generation = self.response_cache.generation()
+
+        version = await self._call_resource(
+            self.resource_type.do_get_version,
+            self.resource_type.get_version,
+            request=request,
+            application_args=self.application_args,
+        )
+        headers = self._validator_headers(processor, version)
+        last_modified = version if isinstance(version, datetime) else None
+        if headers and request.is_fresh(headers['ETag'], last_modified):
+            return processor.get_not_modified_response(headers)
+
+        if self.streaming:
+            try:
+                resource = await self._get_resource(request)
+            except ValidationException as exc:
+                return self._bad_request_error(exc, processor, request)
+            return processor.get_streaming_response(resource, status=status.Ok(), headers=headers)
+
+        if self.single_flight is None:
+            response_status, cached = await self._load(request, processor, headers)
+        else:
+            # requests arriving after an invalidation don't join older loads
+            key = (cache_key or self._cache_key(request, processor), generation)
+            response_status, cached = await self.single_flight.do(key, self._load, request, processor, headers)
+
+        if generation is not None and response_status == status.Ok():
+            self.response_cache.set(cache_key, cached, self.response_cache_ttl, generation)
+
+        return self._cached_response(request, processor, cached, response_status)
+
+    async def _get_resource(self, request):
         try:
-            resource = self.resource_type.get(
+            return await self._call_resource(
+                self.resource_type.do_get,
+                self.resource_type.get,
                 request=request,
                 application_args=self.application_args,
             )
         except ResourceNotFoundException:
             raise error_status.NotFoundException()
 
+    @concurrency.portable
+    async def _load(self, request, processor, headers):
+        # the response is shared by coalesced requests, so it is returned as
+        # a snapshot that every request turns into its own Response
+        try:
+            resource = await self._get_resource(request)
         except ValidationException as exc:
-            return self._bad_request_error(exc, processor, request)
+            response = self._bad_request_error(exc, processor, request)
+        else:
+            response = processor.get_response(data=resource.data, status=status.Ok(), headers=headers)
+            if 'ETag' not in response.headers:
+                response.headers['ETag'] = make_etag(response.body)
 
-        return processor.get_response(
-            data=resource.data,
-            status=status.Ok(),
-        )
+        return response.status, CachedResponse(tuple(response.headers.items()), bytes(response.body))
 
-    def delete(self, request):
+    @concurrency.portable
+    async def delete(self, request):
         try:
             resource = self.resource_type(
                 request=request,
                 application_args=self.application_args,
             )
-            response_resource = resource.remove()
+            response_resource = await self._call_resource(resource.do_remove, resource.remove)
         except ResourceNotFoundException:
             raise error_status.NotFoundException()
 
@@ -164,7 +335,8 @@ class ResourceHandler(Handler):
         processor = Processor(request)
         return processor.get_response(data=response_resource.data, status=status.Ok())
 
-    def put(self, request):
+    @concurrency.portable
+    async def put(self, request):
         resource = self.resource_type(
             request=request,
             application_args=self.application_args,
@@ -191,13 +363,14 @@ class ResourceHandler(Handler):
         resource.update(data)
 
         try:
-            response_resource = resource.replace()
+            response_resource = await self._call_resource(resource.do_replace, resource.replace)
         except ResourceNotFoundException:
             raise error_status.NotFoundException()
 
         return processor.get_response(data=response_resource.data, status=status.Ok())
 
-    def patch(self, request):
+    @concurrency.portable
+    async def patch(self, request):
         resource = self.resource_type(
             request=request,
             application_args=self.application_args,
@@ -214,7 +387,7 @@ class ResourceHandler(Handler):
             )
 
         try:
-            response_resource = resource.change(**data)
+            response_resource = await self._call_resource(resource.do_change, resource.change, **data)
         except ResourceNotFoundException:
             raise error_status.NotFoundException()
 
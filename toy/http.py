@@ -1,9 +1,17 @@
-import re
+import hashlib
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import cached_property, lru_cache
 from io import BytesIO
 from urllib.parse import parse_qs
 
 import accept
-from staty import HTTPStatus, NoContent, Ok
+from staty import HTTPStatus, NoContent, NotModified, Ok, PayloadTooLargeException
+
+from . import concurrency
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 HTTP_METHODS = {
     'PATCH',
@@ -18,13 +26,68 @@ HTTP_METHODS = {
 }
 
 
+@lru_cache(maxsize=512)
 def to_title_case(text):
-    text = text.upper()
-    text = re.sub(r'^HTTP_', '', text)
+    text = text.upper().removeprefix('HTTP_')
     splitted = [(w if w == 'WWW' else w.title()) for w in text.split('_')]
     return '-'.join(splitted)
 
 
+@lru_cache(maxsize=256)
+def _parse_accept(value):
+    return tuple(accept.parse(value))
+
+
+def make_etag(*parts, weak=False) -> str:
+    """Build an entity tag from a hash of ``parts`` (``bytes`` or values converted with ``str``)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes | memoryview) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+
+    etag = f'"{digest.hexdigest()}"'
+    return f'W/{etag}' if weak else etag
+
+
+@lru_cache(maxsize=256)
+def _parse_etags(value) -> frozenset:
+    # weak comparison: W/"x" and "x" match
+    return frozenset(etag.strip().removeprefix('W/') for etag in value.split(','))
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+class Headers(MutableMapping):
+    """Case-insensitive mapping of HTTP headers."""
+
+    def __init__(self, data=None):
+        self._items = {}
+        if data is not None:
+            self.update(data)
+
+    def __getitem__(self, key):
+        return self._items[key.lower()][1]
+
+    def __setitem__(self, key, value):
+        self._items[key.lower()] = (key, value)
+
+    def __delitem__(self, key):
+        del self._items[key.lower()]
+
+    def __iter__(self):
+        return (key for key, _ in self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f'<Headers {dict(self.items())!r}>'
+
+
 class _AnonymousUser:
     @property
     def authenticated(self):
@@ -45,32 +108,14 @@ def parse_content_type(content_type, default_charset='iso-8859-1'):
 
 
 class Request:
-    def __init__(self, environ):
+    def __init__(self, environ, max_body_size=None):
+        self.environ = environ
         self.method = environ.get('REQUEST_METHOD', 'GET').upper()
         self.path = environ.get('PATH_INFO', '/')
 
-        query_string = environ.get('QUERY_STRING', '')
-        self.query_string = parse_qs(query_string)
-
-        headers = {}
-        for key, value in environ.items():
-            if not key.startswith('HTTP_'):
-                continue
-
-            key = to_title_case(key)
-            headers[key] = value
-
-        self.headers = headers
-
-        self.content_type = environ.get('CONTENT_TYPE', 'application/octet-stream')
-        content_type, charset = parse_content_type(self.content_type)
+        content_type, charset = parse_content_type(environ.get('CONTENT_TYPE', 'application/octet-stream'))
         self.content_type = content_type
         self.charset = charset
-        self.headers['Content-Type'] = f'{self.content_type}; {self.charset}'
-
-        accept_charset = self.headers.get('Accept-Charset', self.charset).lower()
-        self.accept = accept.parse(self.headers.get('Accept', self.content_type))
-        self.accept_charset = accept.parse(accept_charset)
 
         self.path_arguments = {}
         self.user = _AnonymousUser()
@@ -78,16 +123,135 @@ class Request:
         try:
             self.content_length = int(environ.get('CONTENT_LENGTH', 0))
         except (TypeError, ValueError):
-            self.content_stream = 0
+            self.content_length = 0
 
         self.content_stream = environ['wsgi.input']
+        self.max_body_size = max_body_size
+        self._remaining = self.content_length
+        self._body = None
         self._cached_data = ''
 
+    # Headers, query string and Accept values are only parsed when a handler
+    # asks for them.
+    @cached_property
+    def query_string(self):
+        return parse_qs(self.environ.get('QUERY_STRING', ''))
+
+    @cached_property
+    def headers(self):
+        headers = Headers()
+        for key, value in self.environ.items():
+            if key.startswith('HTTP_'):
+                headers[to_title_case(key)] = value
+
+        headers['Content-Type'] = f'{self.content_type}; {self.charset}'
+        return headers
+
+    def get_header(self, name, default=None):
+        """Return a single header value without building :attr:`headers`."""
+        if 'headers' in self.__dict__:
+            return self.headers.get(name, default)
+
+        key = name.upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        return self.environ.get(key, default)
+
+    @property
+    def accept_header(self):
+        return self.environ.get('HTTP_ACCEPT', self.content_type)
+
+    @property
+    def accept_charset_header(self):
+        return self.environ.get('HTTP_ACCEPT_CHARSET', self.charset).lower()
+
+    @cached_property
+    def accept(self):
+        return list(_parse_accept(self.accept_header))
+
+    @cached_property
+    def accept_charset(self):
+        return list(_parse_accept(self.accept_charset_header))
+
+    def is_fresh(self, etag: str | None = None, last_modified: datetime | None = None) -> bool:
+        """Whether the client already has the current representation according
+        to the ``If-None-Match`` or, when it is absent, ``If-Modified-Since`` header."""
+        if_none_match = self.get_header('If-None-Match')
+        if if_none_match is not None:
+            if etag is None:
+                return False
+            etags = _parse_etags(if_none_match)
+            return '*' in etags or etag.removeprefix('W/') in etags
+
+        if_modified_since = self.get_header('If-Modified-Since')
+        if if_modified_since is None or last_modified is None:
+            return False
+
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    def _check_body_size(self):
+        if self.max_body_size is not None and self.content_length > self.max_body_size:
+            raise PayloadTooLargeException(f'Request body larger than {self.max_body_size} bytes')
+
+    def iter_body(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield the request body in chunks of at most ``chunk_size`` bytes.
+
+        Raises :class:`staty.PayloadTooLargeException` before reading anything
+        when the body is larger than ``max_body_size``.
+        """
+        if self._body is not None:
+            yield self._body
+            return
+
+        self._check_body_size()
+        while self._remaining > 0:
+            chunk = self.content_stream.read(min(chunk_size, self._remaining))
+            if not chunk:
+                break
+            self._remaining -= len(chunk)
+            yield chunk
+
+    def readinto(self, buffer) -> int:
+        """Read the next part of the body into the writable ``buffer``.
+
+        Returns the number of bytes read, ``0`` at the end of the body.
+        """
+        self._check_body_size()
+
+        view = memoryview(buffer).cast('B')[: self._remaining]
+        if not view:
+            return 0
+
+        readinto = getattr(self.content_stream, 'readinto', None)
+        if readinto is not None:
+            size = readinto(view) or 0
+        else:
+            chunk = self.content_stream.read(len(view))
+            size = len(chunk)
+            view[:size] = chunk
+
+        self._remaining -= size
+        return size
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = b''.join(self.iter_body())
+        return self._body
+
     @property
     def data(self):
         if not self._cached_data:
-            content = self.content_stream.read(self.content_length)
-            self._cached_data = content.decode(self.charset)
+            self._cached_data = self.body.decode(self.charset)
         return self._cached_data
 
     @property
@@ -101,7 +265,7 @@ class Request:
 class Response:
     def __init__(
         self,
-        data: str,
+        data: str | bytes | memoryview,
         status: HTTPStatus = None,
         headers=None,
         content_type='application/octet-stream; charset=iso-8859-1',
@@ -113,10 +277,13 @@ class Response:
 
         self.status = status
 
-        if status == NoContent():
+        if status == NoContent() or status == NotModified():
             data = None
             content_type = None
             charset = None
+        elif isinstance(data, bytes | memoryview):
+            # binary bodies only carry a charset when the content type has one
+            content_type, charset = parse_content_type(content_type, default_charset=None)
         else:
             content_type, charset = parse_content_type(content_type)
 
@@ -134,35 +301,261 @@ class Response:
 
             self.headers[to_title_case(key)] = value
 
-        if content_type:
+        if content_type and charset:
             self.headers['Content-Type'] = f'{content_type}; charset={charset}'
+        elif content_type:
+            self.headers['Content-Type'] = content_type
 
     @property
-    def content_stream(self):
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self.__dict__.pop('body', None)
+        self.__dict__.pop('content_length', None)
+
+    @cached_property
+    def body(self) -> bytes | memoryview:
+        """Response body as a bytes-like object. ``str`` data is encoded only once."""
+        if isinstance(self.data, (bytes, memoryview)):
+            return self.data
+
         if self.data is None or self.charset is None:
-            return BytesIO()
+            return b''
+
+        return self.data.encode(self.charset)
+
+    @cached_property
+    def content_length(self) -> int | None:
+        if self.data is None and self.content_type is None:
+            return None  # 204 and 304 responses have no body
 
-        return BytesIO(self.data.encode(self.charset))
+        body = self.body
+        if isinstance(body, memoryview):
+            return body.nbytes
+        return len(body)
+
+    @property
+    def content_stream(self):
+        return BytesIO(self.body)
 
     def __repr__(self):
         return f'<Response {self.status!s}>'
 
 
+class StreamingResponse(Response):
+    """Response sent chunk by chunk instead of being held in memory.
+
+    ``data`` is an iterable (or async iterable) of ``bytes`` or ``str``
+    chunks, or a file-like object read ``block_size`` bytes at a time. ``str``
+    chunks are encoded with the response charset.
+    """
+
+    def __init__(self, data, *args, block_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        super().__init__(data, *args, **kwargs)
+        self.block_size = block_size
+
+    @property
+    def is_file(self):
+        return hasattr(self.data, 'read')
+
+    def _encode(self, chunk):
+        if isinstance(chunk, str):
+            return chunk.encode(self.charset)
+        return chunk
+
+    def __iter__(self):
+        if self.data is None:
+            return
+
+        if self.is_file:
+            while chunk := self.data.read(self.block_size):
+                yield self._encode(chunk)
+            return
+
+        if hasattr(self.data, '__aiter__') and not hasattr(self.data, '__iter__'):
+            iterator = aiter(self.data)
+            while (chunk := concurrency.run_sync(anext, iterator, None)) is not None:
+                if chunk:
+                    yield self._encode(chunk)
+            return
+
+        for chunk in self.data:
+            if chunk:
+                yield self._encode(chunk)
+
+    async def __aiter__(self):
+        if hasattr(self.data, '__aiter__'):
+            async for chunk in self.data:
+                if chunk:
+                    yield self._encode(chunk)
+            return
+
+        # blocking iterables and files are read off the event loop
+        iterator = iter(self)
+        while (chunk := await concurrency.run_async(next, iterator, None)) is not None:
+            yield chunk
+
+    @cached_property
+    def body(self) -> bytes:
+        return b''.join(self)
+
+    @property
+    def content_length(self):
+        return None
+
+    def close(self):
+        close = getattr(self.data, 'close', None)
+        if close is not None:
+            close()
+
+    def __repr__(self):
+        return f'<StreamingResponse {self.status!s}>'
+
+
+def asgi_to_environ(scope, body: bytes) -> dict:
+    """Build a WSGI-like environ from an ASGI HTTP ``scope`` and request ``body``."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+    }
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+
+        key = f'HTTP_{name}'
+        if key in environ:
+            # cookie pairs are separated by semicolons, every other header by commas
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            value = f'{environ[key]}{separator}{value}'
+        environ[key] = value
+
+    return environ
+
+
+async def read_asgi_body(receive, max_body_size=None) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+
+        body.extend(message.get('body', b''))
+        if max_body_size is not None and len(body) > max_body_size:
+            raise PayloadTooLargeException(f'Request body larger than {max_body_size} bytes')
+        if not message.get('more_body', False):
+            break
+
+    return bytes(body)
+
+
+def _response_headers(response: Response) -> list:
+    headers = list(response.headers.items())
+
+    content_length = response.content_length
+    if content_length is not None and not any(key.lower() == 'content-length' for key, _ in headers):
+        headers.append(('Content-Length', str(content_length)))
+
+    return headers
+
+
+def _to_bytes(body) -> bytes:
+    # servers require bytes, so memoryviews are only copied at the boundary
+    if isinstance(body, bytes):
+        return body
+    return bytes(body)
+
+
 class WSGIResponse:
-    def __init__(self, response: Response) -> None:
+    def __init__(self, response: Response, environ=None) -> None:
         self.response = response
+        self.environ = environ or {}
 
     @property
     def status(self) -> str:
         return str(self.response.status)
 
+    @property
+    def headers(self) -> list:
+        return _response_headers(self.response)
+
+    @property
+    def body(self):
+        response = self.response
+        if not isinstance(response, StreamingResponse):
+            return [_to_bytes(response.body)]
+
+        file_wrapper = self.environ.get('wsgi.file_wrapper')
+        if response.is_file and file_wrapper is not None:
+            return file_wrapper(response.data, response.block_size)
+
+        return _ClosingIterator(response)
+
+
+class _ClosingIterator:
+    # WSGI servers call close() on the body iterable once it is sent
+    def __init__(self, response: StreamingResponse):
+        self._response = response
+        self._iterator = iter(response)
+
+    def __iter__(self):
+        return self._iterator
+
+    def close(self):
+        self._iterator.close()
+        self._response.close()
+
+
+class ASGIResponse:
+    def __init__(self, response: Response) -> None:
+        self.response = response
+
+    @property
+    def status(self) -> int:
+        return self.response.status.code
+
     @property
     def headers(self) -> list:
         headers = []
-        for key, value in self.response.headers.items():
-            headers.append((key, value))
+        for key, value in _response_headers(self.response):
+            headers.append((key.lower().encode('latin-1'), str(value).encode('latin-1')))
         return headers
 
     @property
-    def body(self):
-        return [self.response.content_stream.read()]
+    def body(self) -> bytes:
+        return _to_bytes(self.response.body)
+
+    async def send(self, send):
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': self.status,
+                'headers': self.headers,
+            },
+        )
+
+        if not isinstance(self.response, StreamingResponse):
+            await send({'type': 'http.response.body', 'body': self.body})
+            return
+
+        try:
+            async for chunk in self.response:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            self.response.close()
+        await send({'type': 'http.response.body', 'body': b''})
@@ -1,10 +1,43 @@
+from functools import partial
 from typing import Optional
 
-from staty import HTTPStatus, Ok
+from staty import HTTPStatus, NotModified, Ok
 
-from .exceptions import UnsupportedMediaTypeException, ValidationError, ValidationException
-from .http import Request, Response
+from .concurrency import then, then_all
+from .exceptions import ValidationError, ValidationException
+from .http import Request, Response, StreamingResponse
 from .serializers import serializers
+from .validators import compile_validation
+
+
+class ResourceSchema:
+    """Immutable description of the fields of a :class:`Resource` subclass.
+
+    It is compiled once per class and shared by all of its instances, which
+    only keep a list of values indexed like :attr:`fields`.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.names = tuple(field.name for field in self.fields)
+
+        self.index = {}
+        for position, name in enumerate(self.names):
+            if name in self.index:
+                raise TypeError('Duplicated field name')
+            self.index[name] = position
+
+        self.eager_names = frozenset(field.name for field in self.fields if not field.lazy)
+        self.validate = compile_validation(self.fields)
+
+        self._empty_values = [field.empty_value() for field in self.fields]
+        self._mutable_positions = tuple(i for i, value in enumerate(self._empty_values) if value is not None)
+
+    def empty_values(self) -> list:
+        values = self._empty_values[:]
+        for position in self._mutable_positions:
+            values[position] = self.fields[position].empty_value()
+        return values
 
 
 class Resource:
@@ -12,11 +45,29 @@ class Resource:
      Resource objects contains fields with attributes of several types.
 
     :param request: An instance of a :class:`toy.http.Request`
+
+    Subclasses that declare ``__slots__ = ()`` keep instances without a
+    ``__dict__``, which matters for list endpoints building many resources.
     """
 
+    __slots__ = ('request', 'application_args', '_values', '_dirty', '_extra_data')
+
     fields = []
     ignore_extra_data = False
 
+    _schema = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._schema = None  # compiled on first instantiation
+
+    @classmethod
+    def get_schema(cls) -> ResourceSchema:
+        schema = cls._schema
+        if schema is None:
+            schema = cls._schema = ResourceSchema(cls.fields)
+        return schema
+
     def __init__(self, request: Request | None = None, application_args=None, **data):
         self.request = request
 
@@ -24,43 +75,47 @@ class Resource:
             application_args = {}
         self.application_args = application_args
 
-        self._fields = {}
-        for field in self.fields:
-            field_copy = field.copy()
-            if field_copy.name in self._fields:
-                raise TypeError('Duplicated field name')
-
-            self._fields[field_copy.name] = field_copy
-            field_copy.request = request
-            field_copy.application_args = application_args
+        self._values = self.get_schema().empty_values()
+        self._dirty = 0  # bitmask of the positions changed since clean()
 
         self._extra_data = {}
         self.update(data)
 
     def __setitem__(self, key, value):
-        if key not in self._fields:
+        position = self._schema.index.get(key)
+        if position is None:
             self._extra_data[key] = value
             return
 
-        self._fields[key].value = value
+        field = self._schema.fields[position]
+        value = field.convert(value, self.request, self.application_args)
+        if value != self._values[position]:
+            self._dirty |= 1 << position
+        self._values[position] = value
 
     def __getitem__(self, item):
-        return self._fields[item].value
+        return self._values[self._schema.index[item]]
 
     def keys(self, include_lazy=True):
-        return {f.name for f in self._fields.values() if include_lazy or not f.lazy}
+        if include_lazy:
+            return set(self._schema.names)
+        return set(self._schema.eager_names)
 
     def update(self, data):
         for key, value in data.items():
             self[key] = value
 
+    @property
+    def dirty(self) -> set:
+        """Names of the fields changed since the resource was built or :meth:`clean`'ed."""
+        dirty = self._dirty
+        return {name for position, name in enumerate(self._schema.names) if dirty >> position & 1}
+
+    def clean(self):
+        self._dirty = 0
+
     def validate(self, include_lazy=True, raise_exception=False):
-        errors = {}
-        for field in self._fields.values():
-            error = field.validate(include_lazy=include_lazy)
-            if not error:
-                continue
-            errors[field.name] = error
+        errors = self._schema.validate(self._values, include_lazy)
 
         if self.ignore_extra_data:
             return errors
@@ -74,36 +129,95 @@ class Resource:
 
         return errors
 
+    @classmethod
+    def validate_many(cls, items, request=None, application_args=None, include_lazy=True, raise_exception=False):
+        """Build and validate one resource for each dict in ``items``.
+
+        Returns the list of resources (``None`` for items that are not dicts)
+        and the errors of every item keyed by ``'<index>.<field name>'``, the
+        format expected by :class:`toy.handlers.ErrorResponseResource`.
+        """
+        resources = []
+        errors = {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors[str(index)] = [ValidationError('Invalid resource data', str(index), item)]
+                resources.append(None)
+                continue
+
+            resource = cls(request=request, application_args=application_args)
+            resource.update(item)
+            resources.append(resource)
+
+            for name, field_errors in resource.validate(include_lazy=include_lazy).items():
+                errors[f'{index}.{name}'] = field_errors
+
+        if raise_exception and errors:
+            raise ValidationException('Validation Error', errors=errors)
+
+        return resources, errors
+
     @property
     def data(self):
         result = {}
-        for key, field in self._fields.items():
-            result[key] = field.data
+        for field, value in zip(self._schema.fields, self._values):
+            result[field.name] = field.to_data(value)
         return result
 
+    def iter_data(self):
+        """Yield the ``(name, value)`` pairs of :attr:`data` without converting
+        nested resources to dicts, so serializers can encode them incrementally."""
+        for field, value in zip(self._schema.fields, self._values):
+            yield field.name, field.to_shallow_data(value)
+
+    # The do_* hooks may be coroutine functions, in which case the matching
+    # operation returns an awaitable instead of the resulting resource.
     @classmethod
     def get(cls, request=None, application_args=None) -> 'Resource':
-        resource = cls.do_get(request, application_args)
+        return then(cls.do_get(request, application_args), cls._got)
+
+    @classmethod
+    def get_version(cls, request=None, application_args=None):
+        return cls.do_get_version(request, application_args)
+
+    @staticmethod
+    def _got(resource):
         resource.validate()
         return resource
 
     def create(self, parent_resource=None) -> 'Resource':
         self.validate(include_lazy=False, raise_exception=True)
-        resource = self.do_create(parent_resource)
+        return then(self.do_create(parent_resource), self._created)
+
+    def _created(self, resource):
         self.validate(raise_exception=True)
         return resource or self
 
     def replace(self) -> 'Resource':
         self.validate()
-        resource = self.do_replace()
-        return resource or self
+        return then(self.do_replace(), self._done)
 
     # TODO: kwargs could be used to implement JSON-Patch in the future
     def change(self, **kwargs) -> 'Resource':
         self.validate()
-        resource = self.do_change(**kwargs)
+        return then(self.do_change(**kwargs), self._done)
+
+    def _done(self, resource):
         return resource or self
 
+    @classmethod
+    def bulk_create(cls, resources, request=None, application_args=None) -> list['Resource']:
+        for resource in resources:
+            resource.validate(include_lazy=False, raise_exception=True)
+        return then(cls.do_bulk_create(resources, request, application_args), partial(cls._bulk_created, resources))
+
+    @staticmethod
+    def _bulk_created(resources, created):
+        created = created or resources
+        for resource in created:
+            resource.validate(raise_exception=True)
+        return created
+
     def remove(self):
         resource = self.do_remove()
         return resource
@@ -112,9 +226,22 @@ class Resource:
     def do_get(cls, request=None, application_args=None) -> Optional['Resource']:  # maps to get
         pass  # pragma: nocover
 
+    @classmethod
+    def do_get_version(cls, request=None, application_args=None):
+        """Return a cheap version of the resource (a counter, a hash, or a
+        ``datetime`` also used as ``Last-Modified``) to answer conditional GETs
+        without loading it. ``None`` makes the handler hash the response body."""
+        return None
+
     def do_create(self, parent_resource=None) -> Optional['Resource']:  # maps to post
         pass  # pragma: nocover
 
+    @classmethod
+    def do_bulk_create(cls, resources, request=None, application_args=None) -> list['Resource'] | None:
+        # maps to post with a list of resources. Override it to create them all at once
+        results = [resource.do_create() for resource in resources]
+        return then_all(results, lambda created: [new or old for new, old in zip(created, resources)])
+
     def do_replace(self) -> Optional['Resource']:  # maps to put
         pass  # pragma: nocover
 
@@ -135,19 +262,24 @@ class Processor:
 
     def get_data(self) -> dict:
         serializer = self.serializers[self.request.content_type]
-        return serializer.load(self.request.data, self.request.charset)
+        return serializer.load_stream(self.request.iter_body(), self.request.charset)
+
+    def negotiate(self):
+        """Return the content type, serializer and charset of the response."""
+        return self.serializers.negotiate(
+            self.request.accept_header,
+            self.request.accept_charset_header,
+        )
 
     def get_response(self, data: dict, status: HTTPStatus | None = None, headers=None, **kwargs) -> Response:
         if status is None:
             status = Ok()
 
-        content_type = self.request.accept[0].media_type
-        try:
-            serializer = self.serializers[content_type]
-        except KeyError:
-            raise UnsupportedMediaTypeException(content_type)
+        content_type, serializer, charset = self.negotiate()
 
-        data = serializer.dump(data)
+        data = serializer.dump_bytes(data, charset)
+        if not serializer.binary:
+            content_type = f'{content_type}; charset={charset}'
 
         response = Response(
             data=data,
@@ -157,3 +289,30 @@ class Processor:
             **kwargs,
         )
         return response
+
+    def get_not_modified_response(self, headers=None) -> Response:
+        return Response('', status=NotModified(), content_type=None, headers=headers)
+
+    def get_streaming_response(
+        self,
+        resource: Resource,
+        status: HTTPStatus | None = None,
+        headers=None,
+        **kwargs,
+    ) -> Response:
+        """Serialize ``resource`` while the response is being sent."""
+        if status is None:
+            status = Ok()
+
+        content_type, serializer, charset = self.negotiate()
+
+        if serializer.binary:  # binary formats are dumped in one piece anyway
+            return self.get_response(resource.data, status=status, headers=headers, **kwargs)
+
+        return StreamingResponse(
+            data=serializer.iter_dump(resource),
+            status=status,
+            content_type=f'{content_type}; charset={charset}',
+            headers=headers,
+            **kwargs,
+        )
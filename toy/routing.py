@@ -1,8 +1,117 @@
 import re
+from types import MappingProxyType
+from typing import NamedTuple
 
 from . import handlers
 from .exceptions import InvalidRouteHandlerException
 
+_REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+_REGEX_QUANTIFIERS = frozenset('*+?{')
+
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def static_prefix(pattern):
+    """Return the literal text that starts every path matched by ``pattern``.
+
+    Only patterns anchored with ``^`` have a static prefix, any other pattern
+    returns ``None``.
+    """
+    if not pattern.startswith('^') or _has_top_level_alternation(pattern):
+        return None
+
+    prefix = []
+    position = 1
+    while position < len(pattern):
+        char = pattern[position]
+        size = 1
+
+        if char == '\\':
+            char = pattern[position + 1 : position + 2]
+            size = 2
+            if not char or char.isalnum():  # character classes (\d, \w, ...) and anchors (\A, \b, ...)
+                break
+
+        elif char in _REGEX_SPECIAL_CHARS:
+            break
+
+        if pattern[position + size : position + size + 1] in _REGEX_QUANTIFIERS:
+            break  # quantified char is optional or repeated
+
+        prefix.append(char)
+        position += size
+
+    return ''.join(prefix)
+
+
+class _PrefixTree:
+    """Radix tree mapping static route prefixes to route indexes."""
+
+    __slots__ = ('label', 'children', 'indexes')
+
+    def __init__(self, label=''):
+        self.label = label
+        self.children = {}
+        self.indexes = []
+
+    def insert(self, prefix, index):
+        node = self
+        while prefix:
+            child = node.children.get(prefix[0])
+            if child is None:
+                child = _PrefixTree(prefix)
+                node.children[prefix[0]] = child
+                node = child
+                break
+
+            common = 0
+            limit = min(len(child.label), len(prefix))
+            while common < limit and child.label[common] == prefix[common]:
+                common += 1
+
+            if common < len(child.label):
+                split = _PrefixTree(child.label[:common])
+                child.label = child.label[common:]
+                split.children[child.label[0]] = child
+                node.children[prefix[0]] = split
+                child = split
+
+            node = child
+            prefix = prefix[common:]
+
+        node.indexes.append(index)
+
+    def lookup(self, path):
+        node = self
+        indexes = list(node.indexes)
+        while path:
+            node = node.children.get(path[0])
+            if node is None or not path.startswith(node.label):
+                break
+            indexes.extend(node.indexes)
+            path = path[len(node.label) :]
+        return indexes
+
 
 class Route:
     def __init__(self, path, handler):
@@ -15,16 +124,14 @@ class Route:
         self.handler = handler
 
         self.pattern = re.compile(path)
-        self.path_arguments = {}
+        self.prefix = static_prefix(path)
 
     def match(self, path):
         match = self.pattern.search(path)
         if not match:
             return
 
-        self.path_arguments.update(match.groupdict())
-
-        return self.path_arguments
+        return RouteMatch(self, MappingProxyType(match.groupdict()))
 
     def __repr__(self):
         return f'<Route {self.path} {self.handler.__class__.__name__}>'
@@ -33,6 +140,21 @@ class Route:
         return self.pattern == other.pattern and self.handler == other.handler
 
 
+class RouteMatch(NamedTuple):
+    """The result of matching a path against a :class:`Route`.
+
+    Matches are created for each request and are never shared, so they can
+    be used concurrently by threaded and async servers.
+    """
+
+    route: Route
+    path_arguments: MappingProxyType
+
+    @property
+    def handler(self):
+        return self.route.handler
+
+
 class Routes:
     def __init__(
         self,
@@ -45,7 +167,12 @@ class Routes:
         if routes is None:
             routes = []
 
-        self._routes = routes
+        self._routes = []
+        self._prefixes = _PrefixTree()
+        self._unprefixed = []  # indexes of routes that must be checked for every path
+        for route in routes:
+            self.add(route)
+
         self.not_found = not_found
         self.internal_error = internal_error
         self.unauthorized = unauthorized
@@ -61,10 +188,31 @@ class Routes:
         if [r for r in self._routes if r == route]:
             raise ValueError('Duplicated route/handler')
 
+        index = len(self._routes)
         self._routes.append(route)
 
+        if route.prefix is None:
+            self._unprefixed.append(index)
+        else:
+            self._prefixes.insert(route.prefix, index)
+
     def add_route(self, path, handler):
         self.add(Route(path, handler))
 
+    def candidates(self, path):
+        """Return, in registration order, the routes that may match ``path``."""
+        indexes = self._prefixes.lookup(path)
+        if self._unprefixed:
+            indexes.extend(self._unprefixed)
+            indexes.sort()
+        elif len(indexes) > 1:
+            indexes.sort()
+        return [self._routes[index] for index in indexes]
+
     def match(self, path):
-        return [route for route in self._routes if route.match(path) is not None]
+        matches = []
+        for route in self.candidates(path):
+            match = route.match(path)
+            if match is not None:
+                matches.append(match)
+        return matches
@@ -1,11 +1,40 @@
+import codecs
 import json
-from json import JSONDecodeError
+import warnings
+from functools import lru_cache
 
-from .exceptions import SerializationException
+import accept
+
+try:
+    import orjson
+except ImportError:  # pragma: nocover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: nocover
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: nocover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: nocover
+    cbor2 = None
+
+from .exceptions import SerializationException, UnsupportedMediaTypeException
+
+DEFAULT_CHARSET = 'iso-8859-1'
+DEFAULT_CHUNK_SIZE = 16 * 1024
+JSON_CHARSETS = frozenset({'utf-8', 'utf8', 'utf-16', 'utf-32'})
 
 
 class Serializer:
     content_type = None
+    binary = False  # binary formats ignore the charset
 
     def load(self, stream, charset):
         raise NotImplementedError('Abstract class')  # pragma: nocover
@@ -13,23 +42,78 @@ class Serializer:
     def dump(self, obj):
         raise NotImplementedError('Abstract class')  # pragma: nocover
 
+    def load_stream(self, chunks, charset):
+        """Load from an iterable of ``bytes`` chunks (see :meth:`toy.http.Request.iter_body`)."""
+        return self.load(b''.join(chunks), charset)
+
+    def iter_dump(self, obj):
+        """Yield ``obj`` serialized in fragments. ``obj`` can also be a :class:`toy.resources.Resource`."""
+        yield self.dump(_to_data(obj))
+
+    def dump_bytes(self, obj, charset) -> bytes:
+        return self.dump(obj).encode(charset)
+
+
+def _is_resource(obj):
+    return hasattr(obj, 'iter_data')
+
+
+def _to_data(obj):
+    if _is_resource(obj):
+        return {key: _to_data(value) for key, value in obj.iter_data()}
+    if isinstance(obj, list | tuple) and any(_is_resource(item) for item in obj):
+        return [_to_data(item) for item in obj]
+    return obj
+
+
+def _select_charset(accept_charset):
+    for media_type in accept.parse(accept_charset):
+        try:
+            codecs.lookup(media_type.media_type)
+        except LookupError:
+            continue
+        return media_type.media_type
+    return DEFAULT_CHARSET
+
 
 class SerializersManager:
     _instance = None
 
-    def __init__(self):
+    def __init__(self, negotiation_cache_size=128):
         self._serializers = {}
+        self._negotiate = lru_cache(maxsize=negotiation_cache_size)(self._select)
 
     def register(self, serializer_class: type[Serializer]):
         if not serializer_class.content_type:
             raise ValueError('Invalid serializer')
 
         self._serializers[serializer_class.content_type] = serializer_class()
+        self._negotiate.cache_clear()
         return serializer_class
 
     def __getitem__(self, item):
         return self._serializers[item]
 
+    def _select(self, accept_header, accept_charset_header):
+        media_types = accept.parse(accept_header)
+        content_type = media_types[0].media_type if media_types else accept_header
+        return content_type, self._serializers.get(content_type), _select_charset(accept_charset_header)
+
+    def negotiate(self, accept_header, accept_charset_header=DEFAULT_CHARSET):
+        """Return the content type, serializer and charset for raw ``Accept`` and
+        ``Accept-Charset`` header values.
+
+        Results are kept in a bounded LRU cache because real traffic only
+        sends a handful of distinct headers.
+        """
+        content_type, serializer, charset = self._negotiate(accept_header, accept_charset_header)
+        if serializer is None:
+            raise UnsupportedMediaTypeException(content_type)
+        return content_type, serializer, charset
+
+    def negotiation_cache_info(self):
+        return self._negotiate.cache_info()
+
     @classmethod
     def get(cls):
         if cls._instance is None:
@@ -40,21 +124,237 @@ class SerializersManager:
 serializers = SerializersManager.get()
 
 
+class JSONBackend:
+    """Standard library JSON backend. Its output is always ASCII."""
+
+    name = 'json'
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def loads(self, content: str | bytes):
+        return json.loads(content)
+
+    def dumps(self, obj) -> str:
+        return json.dumps(obj)
+
+    def dumps_ascii(self, obj) -> str:
+        """Like :meth:`dumps`, but non-ASCII characters are always escaped, so
+        the output can be encoded with any charset (used by streamed bodies)."""
+        return self.dumps(obj)
+
+    def dumps_bytes(self, obj, charset) -> bytes:
+        return json.dumps(obj).encode(charset)
+
+
+class OrjsonBackend(JSONBackend):
+    name = 'orjson'
+
+    @classmethod
+    def available(cls):
+        return orjson is not None
+
+    def loads(self, content: str | bytes):
+        return orjson.loads(content)
+
+    def dumps(self, obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    def dumps_ascii(self, obj) -> str:
+        content = self.dumps(obj)
+        if content.isascii():
+            return content
+        return json.dumps(obj)
+
+    def dumps_bytes(self, obj, charset) -> bytes:
+        content = orjson.dumps(obj)  # UTF-8 encoded, non-ASCII characters are not escaped
+        if content.isascii() or charset.lower() in JSON_CHARSETS:
+            return content
+        return super().dumps_bytes(obj, charset)
+
+
+class UjsonBackend(JSONBackend):
+    name = 'ujson'
+
+    @classmethod
+    def available(cls):
+        return ujson is not None
+
+    def loads(self, content: str | bytes):
+        return ujson.loads(content)
+
+    def dumps(self, obj) -> str:
+        return ujson.dumps(obj)
+
+    def dumps_bytes(self, obj, charset) -> bytes:
+        return ujson.dumps(obj).encode(charset)
+
+
+JSON_BACKENDS = {backend.name: backend for backend in (OrjsonBackend, UjsonBackend, JSONBackend)}
+
+
+def get_json_backend(name='auto') -> JSONBackend:
+    """Return the JSON backend called ``name`` or, with ``'auto'``, the fastest
+    one installed. Falls back to the standard library backend."""
+    if name == 'auto':
+        backend_class = next(b for b in JSON_BACKENDS.values() if b.available())
+        return backend_class()
+
+    try:
+        backend_class = JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown JSON backend {name!r}')
+
+    if not backend_class.available():
+        warnings.warn(f'JSON backend {name!r} is not installed, using {JSONBackend.name!r}', stacklevel=2)
+        backend_class = JSONBackend
+
+    return backend_class()
+
+
 @serializers.register
 class JSONSerializer(Serializer):
     content_type = 'application/json'
+    backend = JSONBackend()
+
+    @classmethod
+    def use_backend(cls, name='auto'):
+        cls.backend = get_json_backend(name)
 
     def load(self, stream: str | bytes, charset='iso-8859-1') -> dict:
         if isinstance(stream, bytes):
             stream = stream.decode(charset)
 
         try:
-            return json.loads(stream)
-        except JSONDecodeError:
+            return self.backend.loads(stream)
+        except ValueError:
+            raise SerializationException()
+
+    def load_stream(self, chunks, charset='iso-8859-1') -> dict:
+        content = b''.join(chunks)
+
+        # json decodes UTF-8/16/32 and ASCII bytes directly, without a str copy
+        if charset.lower() not in JSON_CHARSETS and not content.isascii():
+            content = content.decode(charset)
+
+        try:
+            return self.backend.loads(content)
+        except ValueError:
             raise SerializationException()
 
     def dump(self, obj: dict) -> str:
-        return json.dumps(obj)
+        return self.backend.dumps(obj)
+
+    def dump_bytes(self, obj: dict, charset='iso-8859-1') -> bytes:
+        return self.backend.dumps_bytes(obj, charset)
+
+    def iter_dump(self, obj, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield the JSON document for ``obj`` in chunks of about ``chunk_size``
+        characters, walking resources directly instead of building their
+        :attr:`~toy.resources.Resource.data` dicts."""
+        buffer = []
+        size = 0
+        for fragment in self._iter_encode(obj):
+            buffer.append(fragment)
+            size += len(fragment)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield ''.join(buffer)
+
+    def _iter_encode(self, obj):
+        if _is_resource(obj):
+            separator = '{'
+            for key, value in obj.iter_data():
+                yield f'{separator}{self.backend.dumps_ascii(key)}: '
+                yield from self._iter_encode(value)
+                separator = ', '
+            yield '}' if separator == ', ' else '{}'
+
+        elif isinstance(obj, list | tuple) and any(_is_resource(item) for item in obj):
+            separator = '['
+            for item in obj:
+                yield separator
+                yield from self._iter_encode(item)
+                separator = ', '
+            yield ']'
+
+        else:
+            yield self.backend.dumps_ascii(obj)
+
+
+@serializers.register
+class NDJSONSerializer(Serializer):
+    """Newline delimited JSON: one JSON document per line.
+
+    Bodies are parsed line by line and collections are dumped one record per
+    line, so memory use doesn't grow with the number of records when they
+    are consumed with :meth:`iter_load` and produced with :meth:`iter_dump`.
+    """
+
+    content_type = 'application/x-ndjson'
+
+    @property
+    def backend(self):
+        return JSONSerializer.backend
+
+    def _loads(self, line: bytes, charset):
+        if charset.lower() not in JSON_CHARSETS and not line.isascii():
+            line = line.decode(charset)
+
+        try:
+            return self.backend.loads(line)
+        except ValueError:
+            raise SerializationException()
+
+    def iter_load(self, chunks, charset='utf-8'):
+        """Yield the records of an iterable of ``bytes`` chunks as soon as each line is complete."""
+        pending = b''
+        for chunk in chunks:
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield self._loads(line, charset)
+
+        if pending.strip():
+            yield self._loads(pending, charset)
+
+    def load_stream(self, chunks, charset='utf-8') -> list:
+        return list(self.iter_load(chunks, charset))
+
+    def load(self, stream: str | bytes, charset='utf-8') -> list:
+        if isinstance(stream, str):
+            stream = stream.encode(charset)
+        return self.load_stream([stream], charset)
+
+    def dump(self, obj) -> str:
+        return ''.join(self.iter_dump(obj))
+
+    def iter_dump(self, obj, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield ``obj`` one record per line in chunks of about ``chunk_size``
+        characters. ``obj`` can be a resource, a dict or any iterable of them,
+        including generators."""
+        if _is_resource(obj) or isinstance(obj, dict):
+            obj = [obj]
+
+        buffer = []
+        size = 0
+        for record in obj:
+            line = self.backend.dumps_ascii(_to_data(record)) + '\n'
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield ''.join(buffer)
 
 
 @serializers.register
@@ -66,3 +366,49 @@ class PassThroughSerializer(Serializer):
 
     def dump(self, obj) -> str:
         return str(obj)
+
+
+class BinarySerializer(Serializer):
+    binary = True
+
+    def _loads(self, content: bytes):
+        raise NotImplementedError('Abstract class')  # pragma: nocover
+
+    def load(self, stream: bytes, charset=None):
+        try:
+            return self._loads(bytes(stream))
+        except (ValueError, TypeError):
+            raise SerializationException()
+
+    def dump_bytes(self, obj, charset=None) -> bytes:
+        return self.dump(obj)
+
+
+class MessagePackSerializer(BinarySerializer):
+    content_type = 'application/msgpack'
+
+    def _loads(self, content):
+        return msgpack.unpackb(content, raw=False)
+
+    def dump(self, obj) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+
+class CBORSerializer(BinarySerializer):
+    content_type = 'application/cbor'
+
+    def _loads(self, content):
+        try:
+            return cbor2.loads(content)
+        except cbor2.CBORDecodeError as exc:  # not a ValueError in every cbor2 version
+            raise ValueError(str(exc)) from exc
+
+    def dump(self, obj) -> bytes:
+        return cbor2.dumps(obj)
+
+
+if msgpack is not None:  # pragma: nocover
+    serializers.register(MessagePackSerializer)
+
+if cbor2 is not None:  # pragma: nocover
+    serializers.register(CBORSerializer)
@@ -1,18 +1,86 @@
+import os
+import select
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
 
+SERVER_MODES = ('simple', 'threaded', 'prefork')
+
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """WSGI server that handles requests in a bounded pool of threads.
+
+    When every thread is busy the server stops accepting connections until
+    one of them is released, so pending clients wait in the listen backlog.
+    """
+
+    def __init__(self, server_address, handler_class, threads=8, bind_and_activate=True):
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='toy-worker')
+        self._available = threading.BoundedSemaphore(threads)
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+    def process_request(self, request, client_address):
+        self._available.acquire()
+        try:
+            self._executor.submit(self._process_request, request, client_address)
+        except RuntimeError:  # executor was shut down
+            self._available.release()
+            self.shutdown_request(request)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._available.release()
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+class ReusePortMixin:
+    """Bind the listening socket with ``SO_REUSEPORT`` so several processes can
+    listen on the same address and let the kernel balance connections."""
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
 
 class HTTPServer:
-    def __init__(self, application, wsgi_server=WSGIServer, **kwargs):
+    def __init__(self, application, wsgi_server=None, **kwargs):
         self.application = application
 
         self.settings = {
             'hostname': 'localhost',
             'port': 8080,
             'quiet': False,
+            'mode': 'simple',
+            'threads': 8,
+            'workers': os.cpu_count() or 1,
+            'max_requests': 0,
+            'post_fork': None,  # called in every prefork worker before it starts serving
+            'ready_timeout': 10,
         }
         self.settings.update(kwargs)
 
+        if self.mode not in SERVER_MODES:
+            raise ValueError(f'Invalid server mode {self.mode!r}')
+
         self._wsgi_server = wsgi_server
+        self._workers = {}  # pid -> slot
+        self._retiring = set()
+        self._servers = []
+        self._running = False
+        self._restart_requested = False
+        self._wakeup_fds = ()
 
     @property
     def hostname(self):
@@ -22,18 +90,60 @@ class HTTPServer:
     def port(self):
         return int(self.settings['port'])
 
+    @property
+    def mode(self):
+        return self.settings['mode']
+
+    @property
+    def threads(self):
+        return int(self.settings['threads'])
+
+    @property
+    def workers(self):
+        return int(self.settings['workers'])
+
+    @property
+    def max_requests(self):
+        return int(self.settings['max_requests'])
+
     def _print(self, msg):
         if self.settings['quiet']:
             return
 
         print(msg)
 
-    def run(self):
-        server = self._wsgi_server(
+    def _server_class(self):
+        if self._wsgi_server is not None:
+            return self._wsgi_server
+
+        if self.mode == 'simple' or self.threads == 1:
+            return WSGIServer
+
+        return ThreadPoolWSGIServer
+
+    def make_server(self, reuse_port=False):
+        server_class = self._server_class()
+
+        kwargs = {}
+        if isinstance(server_class, type) and issubclass(server_class, ThreadPoolWSGIServer):
+            kwargs['threads'] = self.threads
+
+        if reuse_port:
+            server_class = type(f'ReusePort{server_class.__name__}', (ReusePortMixin, server_class), {})
+
+        server = server_class(
             (self.hostname, self.port),
             WSGIRequestHandler,
+            **kwargs,
         )
         server.set_app(self.application)
+        return server
+
+    def run(self):
+        if self.mode == 'prefork':
+            return self._run_prefork()
+
+        server = self.make_server()
 
         self._print(f'Serving on {self.hostname}:{self.port} (press ctrl-c to stop)...')
 
@@ -41,3 +151,214 @@ class HTTPServer:
             server.serve_forever()
         except KeyboardInterrupt:
             self._print('\nStopping...')
+
+    # Pre-fork mode: the master process binds one SO_REUSEPORT socket per
+    # worker slot and only supervises the workers, which serve requests from
+    # the socket of their slot until they receive SIGTERM (finishing the
+    # requests in progress) or reach max_requests. The master keeps the
+    # sockets open, so connections waiting in the accept queue of a worker
+    # that exits are served by its replacement instead of being reset.
+    #
+    # Signal handlers only set flags and wake up the supervisor loop through
+    # signal.set_wakeup_fd(), which reaps, restarts and stops the workers.
+    def _run_prefork(self):
+        self._running = True
+        self._restart_requested = False
+
+        wakeup_fd, wakeup_write_fd = os.pipe()
+        os.set_blocking(wakeup_fd, False)
+        os.set_blocking(wakeup_write_fd, False)
+        self._wakeup_fds = (wakeup_fd, wakeup_write_fd)
+        signal.set_wakeup_fd(wakeup_write_fd)
+
+        signal.signal(signal.SIGTERM, self._stop_workers)
+        signal.signal(signal.SIGINT, self._stop_workers)
+        signal.signal(signal.SIGHUP, self._restart_workers)
+        signal.signal(signal.SIGCHLD, self._child_exited)
+
+        self._servers = [self.make_server(reuse_port=True) for _ in range(self.workers)]
+
+        self._print(
+            f'Serving on {self.hostname}:{self.port} with {self.workers} workers (press ctrl-c to stop)...',
+        )
+
+        stopping = False
+        try:
+            for slot in range(self.workers):
+                self._spawn_worker(slot)
+
+            while self._workers:
+                if not self._running and not stopping:
+                    stopping = True
+                    self._signal_workers(signal.SIGTERM)
+                elif self._restart_requested and not stopping:
+                    self._restart_requested = False
+                    self._rolling_restart()
+
+                self._reap_workers()
+                if self._workers:
+                    # signals received after the flags were checked leave a byte to read
+                    select.select([wakeup_fd], [], [])
+                self._drain_wakeup()
+        finally:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            self._wakeup_fds = ()
+            for server in self._servers:
+                server.socket.close()
+
+        self._print('\nStopping...')
+
+    def _drain_wakeup(self):
+        try:
+            while os.read(self._wakeup_fds[0], 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _reap_workers(self):
+        while self._workers:
+            try:
+                pid, wait_status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._workers.clear()
+                return
+
+            if not pid:
+                return
+
+            slot = self._workers.pop(pid, None)
+            if pid in self._retiring or not self._running or slot is None:
+                self._retiring.discard(pid)
+                continue
+
+            if os.waitstatus_to_exitcode(wait_status) != 0:
+                time.sleep(1)  # avoid a fork loop when workers crash on startup
+            self._spawn_worker(slot)
+
+    # noinspection PyUnusedLocal
+    def _stop_workers(self, signum, frame):
+        self._running = False
+
+    # noinspection PyUnusedLocal
+    def _restart_workers(self, signum, frame):
+        self._restart_requested = True
+
+    # noinspection PyUnusedLocal
+    def _child_exited(self, signum, frame):
+        pass  # only wakes up the supervisor loop
+
+    def _rolling_restart(self):
+        # each worker is only stopped after its replacement is ready to accept
+        # connections from the same socket
+        for pid, slot in list(self._workers.items()):
+            if not self._running:
+                return
+
+            if pid in self._retiring or pid not in self._workers:
+                continue
+
+            if self._spawn_worker(slot, wait_ready=True) is None:
+                continue  # the old worker keeps serving this slot
+
+            self._retiring.add(pid)
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # already exited, reaped by the supervisor loop
+
+    def _signal_workers(self, signum):
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _spawn_worker(self, slot, wait_ready=False):
+        """Fork a worker serving the socket of ``slot`` and return its pid. With
+        ``wait_ready`` wait until it starts serving, killing it and returning
+        ``None`` when it doesn't start in time."""
+        ready_fd = None
+        if wait_ready:
+            read_fd, ready_fd = os.pipe()
+
+        pid = os.fork()
+        if pid:
+            if not wait_ready:
+                self._workers[pid] = slot
+                return pid
+
+            os.close(ready_fd)
+            try:
+                readable, _, _ = select.select([read_fd], [], [], self.settings['ready_timeout'])
+                ready = bool(readable) and os.read(read_fd, 1) == b'1'
+            finally:
+                os.close(read_fd)
+
+            if not ready:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                os.waitpid(pid, 0)
+                return None
+
+            self._workers[pid] = slot
+            return pid
+
+        exit_code = 0
+        try:
+            if wait_ready:
+                os.close(read_fd)
+            self._run_worker(slot, ready_fd)
+        except Exception:
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _run_worker(self, slot, ready_fd=None):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # ctrl-c is handled by the supervisor
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.set_wakeup_fd(-1)
+        for fd in self._wakeup_fds:
+            os.close(fd)
+
+        server = self._servers[slot]
+        for other in self._servers:
+            if other is not server:
+                other.socket.close()
+
+        post_fork = self.settings['post_fork']
+        if post_fork is not None:
+            post_fork()
+
+        def stop(*_):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+
+        if self.max_requests:
+            served = 0
+            process_request = server.process_request
+
+            def counted_process_request(request, client_address):
+                nonlocal served
+                process_request(request, client_address)
+                served += 1
+                if served == self.max_requests:
+                    stop()
+
+            server.process_request = counted_process_request
+
+        if ready_fd is not None:
+            os.write(ready_fd, b'1')
+            os.close(ready_fd)
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
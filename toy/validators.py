@@ -1,18 +1,58 @@
+import re
+from typing import NamedTuple
+
 from .exceptions import ValidationError
 
 
+class FieldValue(NamedTuple):
+    name: str
+    value: object
+
+
 class Validator:
+    """Validators check values only, so a single instance is shared by every
+    resource built from the same schema. Subclasses implement
+    :meth:`validate_value` (or the older :meth:`validate`)."""
+
     def _error(self, message, field):
         return ValidationError(message, field.name, field.value)
 
     def validate(self, field):
-        raise NotImplementedError('Abstract class')  # pragma: nocover
+        return self.validate_value(field.name, field.value)
+
+    def validate_value(self, name, value):
+        if type(self).validate is Validator.validate:
+            raise NotImplementedError('Abstract class')  # pragma: nocover
+        return self.validate(FieldValue(name, value))
+
+    def check(self, name, value):
+        """Validate ``value`` with :meth:`validate` when a subclass overrides it
+        (even below a validator implementing :meth:`validate_value`) or with
+        :meth:`validate_value` otherwise."""
+        if type(self).validate is not Validator.validate:
+            return self.validate(FieldValue(name, value))
+        return self.validate_value(name, value)
+
+    def source(self, constant) -> list | None:
+        """Return the lines of Python code used by :func:`compile_validation`
+        or ``None`` to call :meth:`check` instead.
+
+        The code checks ``value`` and calls ``error(message)`` at most once.
+        ``constant(obj)`` returns the name of a global bound to ``obj``.
+        """
+        return None
 
 
 class Required(Validator):
-    def validate(self, field):
-        if not field.value:
-            return self._error('Required field', field)
+    def validate_value(self, name, value):
+        if not value:
+            return self._error('Required field', FieldValue(name, value))
+
+    def source(self, constant):
+        return [
+            'if not value:',
+            "    error('Required field')",
+        ]
 
 
 class Length(Validator):
@@ -32,22 +72,42 @@ class Length(Validator):
         self.min_length = min_length
         self.max_length = max_length
 
-    def validate(self, field):
-        value = field.value
-
+    def validate_value(self, name, value):
         if value is None:
             return
 
         try:
             length = len(value)
         except TypeError:
-            return self._error('Value has no length', field)
+            return self._error('Value has no length', FieldValue(name, value))
 
         if self.max_length is not None and length > self.max_length:
-            return self._error('Invalid max length', field)
+            return self._error('Invalid max length', FieldValue(name, value))
 
         if self.min_length is not None and length < self.min_length:
-            return self._error('Invalid min length', field)
+            return self._error('Invalid min length', FieldValue(name, value))
+
+    def source(self, constant):
+        lines = [
+            'if value is not None:',
+            '    try:',
+            '        length = len(value)',
+            '    except TypeError:',
+            "        error('Value has no length')",
+        ]
+
+        checks = []
+        if self.max_length is not None:
+            checks.append(f"if length > {constant(self.max_length)}: error('Invalid max length')")
+        if self.min_length is not None:
+            checks.append(f"if length < {constant(self.min_length)}: error('Invalid min length')")
+
+        if checks:
+            lines.append('    else:')
+            lines.append(f'        {checks[0]}')
+            lines.extend(f'        el{check}' for check in checks[1:])
+
+        return lines
 
 
 class Range(Validator):
@@ -58,16 +118,33 @@ class Range(Validator):
         self.min_value = min_value
         self.max_value = max_value
 
-    def validate(self, field):
-        value = field.value
+    def validate_value(self, name, value):
         try:
             if self.max_value is not None and value > self.max_value:
-                return self._error('Invalid max value', field)
+                return self._error('Invalid max value', FieldValue(name, value))
 
             if self.min_value is not None and value < self.min_value:
-                return self._error('Invalid min value', field)
+                return self._error('Invalid min value', FieldValue(name, value))
         except TypeError:
-            return self._error('Invalid value type for this field', field)
+            return self._error('Invalid value type for this field', FieldValue(name, value))
+
+    def source(self, constant):
+        checks = []
+        if self.max_value is not None:
+            checks.append(f"if value > {constant(self.max_value)}: error('Invalid max value')")
+        if self.min_value is not None:
+            checks.append(f"if value < {constant(self.min_value)}: error('Invalid min value')")
+
+        if not checks:
+            return []
+
+        return [
+            'try:',
+            f'    {checks[0]}',
+            *(f'    el{check}' for check in checks[1:]),
+            'except TypeError:',
+            "    error('Invalid value type for this field')",
+        ]
 
 
 class Type(Validator):
@@ -76,21 +153,111 @@ class Type(Validator):
             allowed_types = ()
         self.allowed_types = tuple(allowed_types)
 
-    def validate(self, field):
-        if field.value is None:
+    def validate_value(self, name, value):
+        if value is None:
             return
 
-        if not isinstance(field.value, self.allowed_types):
-            return self._error('Invalid value type for this field', field)
+        if not isinstance(value, self.allowed_types):
+            return self._error('Invalid value type for this field', FieldValue(name, value))
 
+    def source(self, constant):
+        return [
+            f'if value is not None and not isinstance(value, {constant(self.allowed_types)}):',
+            "    error('Invalid value type for this field')",
+        ]
 
-class TypeList(Type):
-    def validate(self, field):
-        value = field.value
 
+class TypeList(Type):
+    def validate_value(self, name, value):
         if not isinstance(value, tuple | list):
-            return self._error('Field must be a list or tuple', field)
+            return self._error('Field must be a list or tuple', FieldValue(name, value))
 
         for item in value:
-            if not isinstance(item, tuple(self.allowed_types)):
-                return self._error('Invalid value type for this field', field)
+            if not isinstance(item, self.allowed_types):
+                return self._error('Invalid value type for this field', FieldValue(name, value))
+
+    def source(self, constant):
+        return [
+            'if not isinstance(value, (tuple, list)):',
+            "    error('Field must be a list or tuple')",
+            'else:',
+            '    for item in value:',
+            f'        if not isinstance(item, {constant(self.allowed_types)}):',
+            "            error('Invalid value type for this field')",
+            '            break',
+        ]
+
+
+_ERROR_CALL = re.compile(r"\berror\(('[^']*')\)")
+
+
+def _defined_in(cls, attribute):
+    for klass in cls.__mro__:
+        if attribute in vars(klass):
+            return klass
+
+
+def _compiled_source(validator, constant):
+    # subclasses changing validate(), _error() or validate_value() below the
+    # class that defines source() are called instead of inlined
+    cls = type(validator)
+    source_class = _defined_in(cls, 'source')
+    for attribute in ('validate', '_error', 'validate_value'):
+        defined_in = _defined_in(cls, attribute)
+        if defined_in is not source_class and issubclass(defined_in, source_class):
+            return None
+    return validator.source(constant)
+
+
+def compile_validation(fields):
+    """Generate a single function validating the values of ``fields``.
+
+    The function is called as ``validate(values, include_lazy)`` with the
+    values in the same order as ``fields`` and returns a dict of errors with
+    the same content as calling ``field.validate_value(value)`` for each field.
+    """
+    namespace = {'ValidationError': ValidationError}
+
+    def constant(obj):
+        name = f'c{len(namespace)}'
+        namespace[name] = obj
+        return name
+
+    lines = ['def validate(values, include_lazy=True):', '    errors = {}']
+    for position, field in enumerate(fields):
+        body = [
+            f'value = values[{position}]',
+            'field_errors = []',
+            f'name = {constant(field.name)}',
+        ]
+
+        for validator in field.validators:
+            source = _compiled_source(validator, constant)
+            if source is None:
+                body.extend(
+                    [
+                        f'validation_error = {constant(validator)}.check(name, value)',
+                        'if validation_error:',
+                        '    field_errors.append(validation_error)',
+                    ],
+                )
+                continue
+
+            body.extend(source)
+
+        body.extend(['if field_errors:', '    errors[name] = field_errors'])
+
+        indent = '    '
+        if field.lazy:
+            lines.append('    if include_lazy:')
+            indent = '        '
+        lines.extend(indent + line for line in body)
+
+    lines.append('    return errors')
+
+    source = _ERROR_CALL.sub(r'field_errors.append(ValidationError(\1, name, value))', '\n'.join(lines))
+    exec(compile(source, f'<validation {", ".join(field.name for field in fields)}>', 'exec'), namespace)  # noqa: S102
+
+    validate = namespace['validate']
+    validate.source = source
+    return validate